@@ -3,35 +3,82 @@ Intent Parser Agent
 Extracts structured travel requirements from natural language input.
 Uses OpenAI's structured output capabilities via LangChain.
 """
+import asyncio
+import functools
 import logging
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.messages import HumanMessage, SystemMessage
 from app.models.travel import TravelIntent, AgentState
 from app.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-class IntentParserAgent:
-    """
-    Agent that parses user's natural language travel request
-    into structured TravelIntent object.
-    """
-
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            api_key=settings.openai_api_key,
-            temperature=0,
-        )
-
-        self.parser = PydanticOutputParser(pydantic_object=TravelIntent)
-
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert travel intent parser and trip planner. Your job is to extract structured travel requirements from natural language.
+# Curated destination images from Unsplash (photo IDs).
+# Module-level so agent construction doesn't rebuild it per request.
+DESTINATION_IMAGES = {
+    "barcelona": "https://images.unsplash.com/photo-1583422409516-2895a77efded?w=1600&h=900&fit=crop&q=80",
+    "tokyo": "https://images.unsplash.com/photo-1540959733332-eab4deabeeaf?w=1600&h=900&fit=crop&q=80",
+    "paris": "https://images.unsplash.com/photo-1502602898657-3e91760cbb34?w=1600&h=900&fit=crop&q=80",
+    "rome": "https://images.unsplash.com/photo-1552832230-c0197dd311b5?w=1600&h=900&fit=crop&q=80",
+    "london": "https://images.unsplash.com/photo-1513635269975-59663e0ac1ad?w=1600&h=900&fit=crop&q=80",
+    "new york": "https://images.unsplash.com/photo-1496442226666-8d4d0e62e6e9?w=1600&h=900&fit=crop&q=80",
+    "dubai": "https://images.unsplash.com/photo-1512453979798-5ea266f8880c?w=1600&h=900&fit=crop&q=80",
+    "lisbon": "https://images.unsplash.com/photo-1585208798174-6cedd86e019a?w=1600&h=900&fit=crop&q=80",
+    "madrid": "https://images.unsplash.com/photo-1539037116277-4db20889f2d4?w=1600&h=900&fit=crop&q=80",
+    "amsterdam": "https://images.unsplash.com/photo-1512470876302-972faa2aa9a4?w=1600&h=900&fit=crop&q=80",
+    "venice": "https://images.unsplash.com/photo-1514890547357-a9ee288728e0?w=1600&h=900&fit=crop&q=80",
+    "prague": "https://images.unsplash.com/photo-1541849546-216549ae216d?w=1600&h=900&fit=crop&q=80",
+    "athens": "https://images.unsplash.com/photo-1555993539-1732b0258235?w=1600&h=900&fit=crop&q=80",
+    "santorini": "https://images.unsplash.com/photo-1570077188670-e3a8d69ac5ff?w=1600&h=900&fit=crop&q=80",
+    "bali": "https://images.unsplash.com/photo-1537996194471-e657df975ab4?w=1600&h=900&fit=crop&q=80",
+    "kyoto": "https://images.unsplash.com/photo-1493976040374-85c8e12f0c0e?w=1600&h=900&fit=crop&q=80",
+    "singapore": "https://images.unsplash.com/photo-1525625293386-3f8f99389edd?w=1600&h=900&fit=crop&q=80",
+    "hong kong": "https://images.unsplash.com/photo-1536599018102-9f803c140fc1?w=1600&h=900&fit=crop&q=80",
+    "sydney": "https://images.unsplash.com/photo-1506973035872-a4ec16b8e8d9?w=1600&h=900&fit=crop&q=80",
+    "istanbul": "https://images.unsplash.com/photo-1524231757912-21f4fe3a7200?w=1600&h=900&fit=crop&q=80",
+}
+
+# Fallback for unknown destinations / errors
+DEFAULT_DESTINATION_IMAGE = "https://images.unsplash.com/photo-1488646953014-85cb44e25828?w=1600&h=900&fit=crop&q=80"
+
+# Curated blurbs for the same destinations: common-path requests skip the
+# description LLM round-trip entirely; unknown cities still use the model
+DESTINATION_DESCRIPTIONS = {
+    "barcelona": "Barcelona pairs golden Mediterranean beaches with Gaudí's dreamlike architecture, buzzing tapas bars, and a walkable old town that rewards aimless wandering. It's a city where culture, sun, and nightlife blend effortlessly into one trip.",
+    "tokyo": "Tokyo is an electrifying collision of neon-lit modernity and centuries-old tradition, where serene shrines sit minutes from the world's best food streets. Every neighborhood feels like its own city waiting to be explored.",
+    "paris": "Paris delivers world-class art, café culture, and iconic landmarks at every turn, from the Louvre to quiet Montmartre lanes. Few cities make simply strolling feel this memorable.",
+    "rome": "Rome layers nearly three thousand years of history into one endlessly walkable city, where ancient ruins, Renaissance masterpieces, and exceptional trattorias share the same cobbled streets. It's a living museum with superb food.",
+    "london": "London combines royal pageantry, free world-class museums, and legendary theatre with some of the most diverse food and neighborhoods in Europe. There's a version of London for every kind of traveler.",
+    "new york": "New York packs iconic skylines, Broadway, world-leading museums, and every cuisine imaginable into one restless, inspiring city. No two days there ever feel the same.",
+    "dubai": "Dubai offers year-round sunshine, futuristic skylines, desert adventures, and superb beaches, all wrapped in effortless luxury. It's an easy, dazzling escape at almost any time of year.",
+    "lisbon": "Lisbon charms with sun-washed hills, tiled facades, soulful fado music, and fresh seafood at honest prices. Its relaxed pace and Atlantic light make it hard to leave.",
+    "madrid": "Madrid is Spain at full volume: grand boulevards, the Prado's masterpieces, and tapas crawls that stretch late into the night. It's a city built for eating, art, and long evenings.",
+    "amsterdam": "Amsterdam's canal rings, world-famous museums, and easygoing cycling culture make it one of Europe's most pleasant cities to explore. Everything you want is a short bike ride away.",
+    "venice": "Venice is simply unlike anywhere else - a car-free maze of canals, bridges, and faded palazzos best discovered by getting deliberately lost. Its romance is entirely earned.",
+    "prague": "Prague's fairy-tale skyline of spires and its perfectly preserved medieval core make it one of Europe's most atmospheric cities, with excellent beer at famously gentle prices.",
+    "athens": "Athens puts you face to face with the birthplace of Western civilization, then rewards you with lively neighborhoods, rooftop views of the Acropolis, and superb Greek food.",
+    "santorini": "Santorini's whitewashed villages perched over a volcanic caldera deliver the Mediterranean's most famous sunsets, paired with crisp island wines and black-sand beaches.",
+    "bali": "Bali blends jungle temples, emerald rice terraces, and world-class surf beaches with a warm, spiritual culture that makes relaxation feel effortless.",
+    "kyoto": "Kyoto is Japan at its most serene - thousands of temples, bamboo groves, and geisha districts preserved alongside refined kaiseki dining. It's the country's cultural heart.",
+    "singapore": "Singapore condenses futuristic gardens, colonial charm, and arguably the world's best street food into one spotless, effortless city-state. It's ideal for travelers who want everything to just work.",
+    "hong kong": "Hong Kong stacks dramatic skyline views, dim sum institutions, and surprisingly wild hiking trails into one compact, high-energy destination.",
+    "sydney": "Sydney pairs its glittering harbour and iconic Opera House with laid-back surf beaches and a superb coffee and dining scene. It's big-city energy with a beach-town soul.",
+    "istanbul": "Istanbul straddles two continents and layers Byzantine, Ottoman, and modern life into one intoxicating city of bazaars, minarets, and Bosphorus views.",
+}
+
+# Description cache: warm-cache requests skip an entire OpenAI round-trip
+_DESCRIPTION_CACHE_MAXSIZE = 512
+_DESCRIPTION_CACHE_TTL = 86400  # 24 hours
+_description_cache: Dict[Tuple, Tuple[float, str]] = {}
+_description_cache_lock = asyncio.Lock()
+
+
+SYSTEM_PROMPT = """You are an expert travel intent parser and trip planner. Your job is to extract structured travel requirements from natural language.
 
 Key responsibilities:
 1. Identify all travel parameters: dates, duration, budget, travelers, preferences
@@ -59,7 +106,7 @@ If the user provides a VAGUE or FLEXIBLE destination description (like "beach",
 
 **CRITICAL - Date Suggestion Logic:**
 If the user does NOT provide specific dates OR provides vague dates like "fall", "spring", "summer", "winter":
-- **ALWAYS suggest dates in the FUTURE** (at least 2-4 weeks from today: {current_date})
+- **ALWAYS suggest dates in the FUTURE** (at least 2-4 weeks from the current date given alongside the user's message)
 - **If user says "fall" or "autumn" without a year:**
   * If current date is before September: suggest fall of CURRENT year
   * If current date is September or later: suggest fall of NEXT year
@@ -86,8 +133,6 @@ When information is ambiguous or missing:
 - ALWAYS suggest specific destination if user provides vague description
 - ALWAYS suggest dates if none provided - never leave dates empty
 
-{format_instructions}
-
 Examples:
 User: "We want to visit Rome, Italy for 10 days with 5000€. Traveling from Copenhagen. 2 adults."
 -> origin: "Copenhagen", destination: "Rome, Italy", duration_days: 10, total_budget: 5000, num_adults: 2, departure_date: [suggest], return_date: [suggest]
@@ -100,40 +145,76 @@ User: "Relaxing beach vacation, budget around 3k, just me and my partner. Travel
 
 User: "Beach for a week with 2000€. Traveling from Paris. 2 adults."
 -> origin: "Paris", destination: "Lisbon, Portugal", interests: ["beach"], total_budget: 2000, num_adults: 2, duration_days: 7, departure_date: [suggest], return_date: [suggest]
-"""),
-            ("human", "{user_message}\n\nCurrent date: {current_date}")
-        ])
+"""
+
+
+class IntentParserAgent:
+    """
+    Agent that parses user's natural language travel request
+    into structured TravelIntent object.
+    """
+
+    def __init__(self):
+        self.llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            api_key=settings.openai_api_key,
+            temperature=0,
+        )
 
-    def _ensure_future_dates(self, intent: TravelIntent) -> TravelIntent:
+        # Specialized bindings built once so both call paths share the same
+        # underlying client (and its keep-alive connection pool). Schema
+        # generation for the structured binding happens here, once per
+        # process; callers that need the raw schema dict should use
+        # travel.TRAVEL_INTENT_JSON_SCHEMA rather than re-deriving it.
+        # - structured parse: native function calling / JSON schema mode,
+        #   no format instructions in the prompt, no free-text re-parsing
+        # - description: slightly creative, capped at 128 tokens since the
+        #   output is intentionally 2-3 sentences
+        self.structured_llm = self.llm.with_structured_output(TravelIntent, method="json_schema")
+        self.desc_llm = self.llm.bind(max_tokens=128, temperature=0.7)
+
+        # The system prompt is fully static - build the message object once
+        # instead of re-rendering the whole template on every request
+        self.system_message = SystemMessage(content=SYSTEM_PROMPT)
+
+    @staticmethod
+    def _shift_to_next_year(d):
+        """Move a date one year forward, clamping Feb 29 to Feb 28"""
+        try:
+            return d.replace(year=d.year + 1)
+        except ValueError:
+            return d.replace(year=d.year + 1, day=28)
+
+    def _ensure_future_dates(self, intent: TravelIntent, now: datetime | None = None) -> TravelIntent:
         """
         Validates that dates are in the future. If not, moves them to next year.
+        `now` lets callers share a single wall-clock read across the request.
         """
-        today = datetime.now().date()
+        today = (now or datetime.now()).date()
         min_future_date = today + timedelta(days=7)  # At least 1 week in the future
 
         if intent.departure_date and intent.departure_date < min_future_date:
             logger.warning(f"⚠️  Departure date {intent.departure_date} is in the past or too soon. Moving to next year.")
 
-            # Calculate how many days into the past
             original_departure = intent.departure_date
-            original_return = intent.return_date
-
-            # Move to next year
-            intent.departure_date = intent.departure_date.replace(year=intent.departure_date.year + 1)
 
+            # Move to next year. This is trusted internal data already
+            # validated at the LLM boundary, so rebuild via model_construct
+            # instead of per-field assignment re-validation
+            data = intent.model_dump()
+            data['departure_date'] = self._shift_to_next_year(original_departure)
             if intent.return_date:
-                intent.return_date = intent.return_date.replace(year=intent.return_date.year + 1)
+                data['return_date'] = self._shift_to_next_year(intent.return_date)
+
+            intent = TravelIntent.model_construct(**data)
 
             logger.info(f"✅ Adjusted dates: {original_departure} -> {intent.departure_date}")
 
         return intent
 
-    def _generate_destination_description(self, destination: str, user_message: str) -> str:
-        """
-        Generate a compelling description of why this destination was chosen for the user's needs.
-        """
-        try:
-            prompt = f"""Based on the user's travel request, explain why {destination} is the perfect choice.
+    def _build_description_prompt(self, destination: str, user_message: str) -> str:
+        """Build the prompt for the destination description LLM call."""
+        return f"""Based on the user's travel request, explain why {destination} is the perfect choice.
 
 User's request: {user_message}
 Chosen destination: {destination}
@@ -142,52 +223,93 @@ Write a compelling 2-3 sentence paragraph explaining why {destination} is ideal
 Focus on what makes it special and how it matches their specific needs (interests, travel style, timing, etc.).
 Be enthusiastic but authentic. Don't mention the budget or specific dates."""
 
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
+    def _fallback_description(self, destination: str) -> str:
+        """Fallback description when the LLM call fails."""
+        return f"{destination} offers a perfect blend of culture, experiences, and unforgettable moments for your journey."
+
+    @staticmethod
+    def _description_cache_key(
+        destination: str,
+        interests: Tuple[str, ...],
+        travel_style: Optional[str]
+    ) -> Tuple:
+        """Canonical cache key for destination descriptions"""
+        return (destination.lower().strip(), tuple(sorted(interests)), travel_style)
+
+    async def _generate_destination_description(
+        self,
+        destination: str,
+        user_message: str,
+        interests: Tuple[str, ...] = (),
+        travel_style: Optional[str] = None,
+        on_chunk=None
+    ) -> str:
+        """
+        Generate a compelling description of why this destination was chosen for the user's needs.
+        Cached by (destination, interests, travel_style) so repeat requests skip the LLM round-trip.
+        Streams the completion; `on_chunk` (sync or async callable) receives
+        each text fragment so callers can start rendering before the full
+        paragraph is done.
+        """
+        # Curated destinations never need the model
+        city = destination.partition(',')[0].strip().lower()
+        canned = DESTINATION_DESCRIPTIONS.get(city)
+        if canned:
+            logger.info(f"📝 Using curated description for {destination}")
+            return canned
+
+        cache_key = self._description_cache_key(destination, interests, travel_style)
+        now = time.monotonic()
+
+        async with _description_cache_lock:
+            cached = _description_cache.get(cache_key)
+            if cached and cached[0] > now:
+                logger.info(f"📝 Using cached description for {destination}")
+                return cached[1]
+
+        try:
+            prompt = self._build_description_prompt(destination, user_message)
+            parts = []
+            async for chunk in self.desc_llm.astream(prompt):
+                text = chunk.content
+                if not text:
+                    continue
+                parts.append(text)
+                if on_chunk is not None:
+                    result = on_chunk(text)
+                    if asyncio.iscoroutine(result):
+                        await result
+            description = "".join(parts).strip()
         except Exception as e:
             logger.error(f"Error generating destination description: {e}")
-            return f"{destination} offers a perfect blend of culture, experiences, and unforgettable moments for your journey."
+            return self._fallback_description(destination)
+
+        async with _description_cache_lock:
+            # Drop oldest entry when full (insertion order is good enough here)
+            if len(_description_cache) >= _DESCRIPTION_CACHE_MAXSIZE:
+                _description_cache.pop(next(iter(_description_cache)))
+            _description_cache[cache_key] = (now + _DESCRIPTION_CACHE_TTL, description)
+
+        return description
 
-    def _fetch_destination_image(self, destination: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _fetch_destination_image(destination: str) -> str:
         """
         Fetch a beautiful image URL from Unsplash for the destination.
         """
         try:
-            # Extract city name (remove country if present)
-            city = destination.split(',')[0].strip().lower()
-
-            # Curated destination images from Unsplash (photo IDs)
-            destination_images = {
-                "barcelona": "https://images.unsplash.com/photo-1583422409516-2895a77efded?w=1600&h=900&fit=crop&q=80",
-                "tokyo": "https://images.unsplash.com/photo-1540959733332-eab4deabeeaf?w=1600&h=900&fit=crop&q=80",
-                "paris": "https://images.unsplash.com/photo-1502602898657-3e91760cbb34?w=1600&h=900&fit=crop&q=80",
-                "rome": "https://images.unsplash.com/photo-1552832230-c0197dd311b5?w=1600&h=900&fit=crop&q=80",
-                "london": "https://images.unsplash.com/photo-1513635269975-59663e0ac1ad?w=1600&h=900&fit=crop&q=80",
-                "new york": "https://images.unsplash.com/photo-1496442226666-8d4d0e62e6e9?w=1600&h=900&fit=crop&q=80",
-                "dubai": "https://images.unsplash.com/photo-1512453979798-5ea266f8880c?w=1600&h=900&fit=crop&q=80",
-                "lisbon": "https://images.unsplash.com/photo-1585208798174-6cedd86e019a?w=1600&h=900&fit=crop&q=80",
-                "madrid": "https://images.unsplash.com/photo-1539037116277-4db20889f2d4?w=1600&h=900&fit=crop&q=80",
-                "amsterdam": "https://images.unsplash.com/photo-1512470876302-972faa2aa9a4?w=1600&h=900&fit=crop&q=80",
-                "venice": "https://images.unsplash.com/photo-1514890547357-a9ee288728e0?w=1600&h=900&fit=crop&q=80",
-                "prague": "https://images.unsplash.com/photo-1541849546-216549ae216d?w=1600&h=900&fit=crop&q=80",
-                "athens": "https://images.unsplash.com/photo-1555993539-1732b0258235?w=1600&h=900&fit=crop&q=80",
-                "santorini": "https://images.unsplash.com/photo-1570077188670-e3a8d69ac5ff?w=1600&h=900&fit=crop&q=80",
-                "bali": "https://images.unsplash.com/photo-1537996194471-e657df975ab4?w=1600&h=900&fit=crop&q=80",
-                "kyoto": "https://images.unsplash.com/photo-1493976040374-85c8e12f0c0e?w=1600&h=900&fit=crop&q=80",
-                "singapore": "https://images.unsplash.com/photo-1525625293386-3f8f99389edd?w=1600&h=900&fit=crop&q=80",
-                "hong kong": "https://images.unsplash.com/photo-1536599018102-9f803c140fc1?w=1600&h=900&fit=crop&q=80",
-                "sydney": "https://images.unsplash.com/photo-1506973035872-a4ec16b8e8d9?w=1600&h=900&fit=crop&q=80",
-                "istanbul": "https://images.unsplash.com/photo-1524231757912-21f4fe3a7200?w=1600&h=900&fit=crop&q=80",
-            }
-
-            # Check if we have a curated image for this destination
-            if city in destination_images:
-                image_url = destination_images[city]
+            # Extract city name (remove country if present); partition avoids
+            # building a throwaway list the way split does
+            city = destination.partition(',')[0].strip().lower()
+
+            # Single lookup against the curated module-level dict
+            image_url = DESTINATION_IMAGES.get(city)
+            if image_url:
                 logger.info(f"🖼️  Using curated image for {destination}")
             else:
                 # Fallback to generic search-based URL
-                city_param = city.replace(' ', '+')
-                image_url = f"https://source.unsplash.com/1600x900/?{city_param},travel,city"
+                image_url = f"https://source.unsplash.com/1600x900/?{city.replace(' ', '+')},travel,city"
                 logger.info(f"🖼️  Using search-based image for {destination}")
 
             return image_url
@@ -195,40 +317,53 @@ Be enthusiastic but authentic. Don't mention the budget or specific dates."""
         except Exception as e:
             logger.error(f"Error fetching destination image: {e}")
             # Fallback to a high-quality generic travel image
-            return "https://images.unsplash.com/photo-1488646953014-85cb44e25828?w=1600&h=900&fit=crop&q=80"
+            return DEFAULT_DESTINATION_IMAGE
 
     def parse_intent(self, state: AgentState) -> AgentState:
+        """
+        Synchronous entry point for scripts and callers outside an event loop.
+        Delegates to parse_intent_async.
+        """
+        return asyncio.run(self.parse_intent_async(state))
+
+    async def parse_intent_async(self, state: AgentState) -> AgentState:
         """
         Main agent function called by LangGraph.
         Extracts TravelIntent from user message.
         """
         try:
-            # Get current date for date suggestions
-            current_date = datetime.now().strftime("%Y-%m-%d")
-
-            # Format the prompt with parser instructions
-            formatted_prompt = self.prompt.format_messages(
-                user_message=state.user_message,
-                current_date=current_date,
-                format_instructions=self.parser.get_format_instructions()
-            )
+            # Read the clock once per request and reuse it everywhere so
+            # dates stay internally consistent even across midnight
+            now = datetime.now()
+            current_date = now.strftime("%Y-%m-%d")
 
-            # Call LLM
-            response = self.llm.invoke(formatted_prompt)
+            # Only the human message varies per request; the system message
+            # is prebuilt in __init__
+            messages = [
+                self.system_message,
+                HumanMessage(content=f"{state.user_message}\n\nCurrent date: {current_date}")
+            ]
 
-            # Parse into TravelIntent
-            parsed_intent = self.parser.parse(response.content)
+            # Call LLM - structured output returns a typed TravelIntent directly
+            parsed_intent = await self.structured_llm.ainvoke(messages)
 
             # Ensure dates are in the future
-            parsed_intent = self._ensure_future_dates(parsed_intent)
+            parsed_intent = self._ensure_future_dates(parsed_intent, now=now)
 
             # Generate destination description and image
             if parsed_intent.destination:
-                parsed_intent.destination_description = self._generate_destination_description(
-                    parsed_intent.destination,
-                    state.user_message
+                # Kick off the description LLM call, then fetch the image while
+                # it is in flight so we only pay one round-trip of latency
+                desc_task = asyncio.create_task(
+                    self._generate_destination_description(
+                        parsed_intent.destination,
+                        state.user_message,
+                        interests=tuple(parsed_intent.interests),
+                        travel_style=parsed_intent.travel_style.value if parsed_intent.travel_style else None
+                    )
                 )
                 parsed_intent.destination_image_url = self._fetch_destination_image(parsed_intent.destination)
+                parsed_intent.destination_description = await desc_task
 
             # Log parsed intent details
             logger.info(f"Parsed Intent - Origin: {parsed_intent.origin}, Destination: {parsed_intent.destination}")
@@ -237,7 +372,7 @@ Be enthusiastic but authentic. Don't mention the budget or specific dates."""
 
             # Update state
             state.parsed_intent = parsed_intent
-            state.agent_messages.append(
+            state.add_message(
                 f"Intent Parser: Understood your request - {parsed_intent.duration_days} days "
                 f"to {parsed_intent.destination or 'flexible destination'} "
                 f"for {parsed_intent.num_adults} adult(s)"
@@ -248,10 +383,24 @@ Be enthusiastic but authentic. Don't mention the budget or specific dates."""
         except Exception as e:
             error_msg = f"Intent Parser Error: {str(e)}"
             state.errors.append(error_msg)
-            state.agent_messages.append(error_msg)
+            state.add_message(error_msg)
 
         return state
 
+    async def parse_intents_batch(self, states: List[AgentState]) -> List[AgentState]:
+        """
+        Parse several states concurrently - useful for backfills, regression
+        runs, and multi-user bursts. All LLM calls overlap on the event loop;
+        a semaphore keeps concurrency inside the provider rate limit.
+        """
+        semaphore = asyncio.Semaphore(settings.llm_batch_concurrency)
+
+        async def _parse_one(state: AgentState) -> AgentState:
+            async with semaphore:
+                return await self.parse_intent_async(state)
+
+        return await asyncio.gather(*(_parse_one(s) for s in states))
+
     def validate_intent(self, intent: TravelIntent) -> Dict[str, Any]:
         """
         Validates parsed intent and returns missing critical fields.
@@ -271,8 +420,24 @@ Be enthusiastic but authentic. Don't mention the budget or specific dates."""
         }
 
 
-# Standalone function for LangGraph node
-def parse_intent_node(state: AgentState) -> AgentState:
+# Lazy module-level singleton so each graph invocation reuses the same
+# ChatOpenAI client and compiled prompt template
+_intent_agent_singleton: IntentParserAgent | None = None
+_intent_agent_lock = threading.Lock()
+
+
+def get_intent_parser_agent() -> IntentParserAgent:
+    """Get (or lazily create) the shared IntentParserAgent instance"""
+    global _intent_agent_singleton
+    if _intent_agent_singleton is None:
+        with _intent_agent_lock:
+            if _intent_agent_singleton is None:
+                _intent_agent_singleton = IntentParserAgent()
+    return _intent_agent_singleton
+
+
+# Standalone async function for LangGraph node
+async def parse_intent_node(state: AgentState) -> AgentState:
     """LangGraph node wrapper for Intent Parser"""
-    agent = IntentParserAgent()
-    return agent.parse_intent(state)
+    agent = get_intent_parser_agent()
+    return await agent.parse_intent_async(state)
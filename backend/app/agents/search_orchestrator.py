@@ -4,8 +4,13 @@ Coordinates parallel searches across flights, hotels, and activities.
 Optimizes for cost, time, and quality.
 """
 import asyncio
+import functools
+import heapq
 import logging
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 from app.models.travel import AgentState, FlightOption, AccommodationOption
 from app.services.serpapi_client import SerpAPIFlightService
 from app.services.amadeus_client import AmadeusFlightService
@@ -14,6 +19,93 @@ from app.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Log separator, built once instead of per log call
+_SEP = "=" * 80
+
+# Bound concurrent outbound provider calls process-wide so a burst of
+# users doesn't exhaust SerpAPI/Amadeus/hotel API quotas
+_OUTBOUND_SEMAPHORE = asyncio.Semaphore(settings.outbound_concurrency)
+
+# Dedicated pool for blocking provider SDK calls, so flight searches never
+# queue behind unrelated asyncio.to_thread work on the default executor
+_IO_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="voyana-io")
+
+
+def _run_blocking(fn, *args, **kwargs):
+    """Run a blocking callable on the dedicated I/O pool"""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(_IO_POOL, functools.partial(fn, *args, **kwargs))
+
+
+async def _bounded(sem: asyncio.Semaphore, coro):
+    """
+    Run a coroutine under a semaphore, returning (not raising) exceptions
+    so one failed provider doesn't cancel its TaskGroup siblings.
+    """
+    async with sem:
+        try:
+            return await coro
+        except Exception as e:
+            return e
+
+
+# Short-lived result cache: identical queries within the TTL skip the
+# external round-trips entirely. TTL stays short because fares change.
+_SEARCH_CACHE_TTL = 900  # 15 minutes
+_SEARCH_CACHE_MAXSIZE = 2048
+_flight_cache: Dict[Tuple, Tuple[float, list]] = {}
+_hotel_cache: Dict[Tuple, Tuple[float, list]] = {}
+_search_cache_locks: Dict[Tuple, asyncio.Lock] = {}
+
+
+def _search_cache_key(intent, kind: str) -> Tuple:
+    """Cache key covering everything the external search depends on"""
+    return (
+        kind,
+        intent.origin,
+        intent.destination,
+        intent.departure_date,
+        intent.return_date,
+        intent.num_adults,
+        intent.num_children,
+    )
+
+
+async def _cached_search(cache: dict, key: Tuple, fetch) -> list:
+    """
+    Return cached results for `key` if fresh, otherwise run `fetch` once.
+    A per-key lock dedupes concurrent identical queries so they don't
+    stampede the provider.
+    """
+    hit = cache.get(key)
+    if hit and hit[0] > time.monotonic():
+        logger.info("🗄️  Search cache hit for %s %s -> %s", key[0], key[1], key[2])
+        # Refresh recency so eviction drops the least recently used query -
+        # popular routes dominate travel traffic, so they should stay hot
+        del cache[key]
+        cache[key] = hit
+        return list(hit[1])
+
+    lock = _search_cache_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another coroutine may have populated the cache while we waited
+        hit = cache.get(key)
+        if hit and hit[0] > time.monotonic():
+            return list(hit[1])
+
+        try:
+            results = await fetch()
+        finally:
+            # Drop the per-key lock entry even when the fetch raises -
+            # otherwise failing queries leave their locks behind and the
+            # dict grows without bound
+            _search_cache_locks.pop(key, None)
+        if results:
+            if len(cache) >= _SEARCH_CACHE_MAXSIZE:
+                cache.pop(next(iter(cache)))
+            cache[key] = (time.monotonic() + _SEARCH_CACHE_TTL, results)
+        return list(results)
+
 
 class SearchOrchestratorAgent:
     """
@@ -35,80 +127,75 @@ class SearchOrchestratorAgent:
             error_msg = "Search Orchestrator: No parsed intent found"
             logger.error(error_msg)
             state.errors.append(error_msg)
-            state.agent_messages.append(error_msg)
+            state.add_message(error_msg)
             return state
 
         intent = state.parsed_intent
 
-        # DEBUG: Log the intent details
-        logger.info(f"=" * 80)
-        logger.info(f"SEARCH ORCHESTRATOR STARTING")
-        logger.info(f"=" * 80)
-        logger.info(f"📍 Origin: {intent.origin}")
-        logger.info(f"📍 Destination: {intent.destination}")
-        logger.info(f"📅 Departure: {intent.departure_date}")
-        logger.info(f"📅 Return: {intent.return_date}")
-        logger.info(f"👥 Adults: {intent.num_adults}, Children: {intent.num_children}")
-        logger.info(f"💰 Budget: {intent.total_budget}")
-        logger.info(f"=" * 80)
-
-        state.agent_messages.append(
+        # DEBUG: Log the intent details - %-style args are only formatted
+        # when INFO is actually enabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_SEP)
+            logger.info("SEARCH ORCHESTRATOR STARTING")
+            logger.info(_SEP)
+            logger.info("📍 Origin: %s", intent.origin)
+            logger.info("📍 Destination: %s", intent.destination)
+            logger.info("📅 Departure: %s", intent.departure_date)
+            logger.info("📅 Return: %s", intent.return_date)
+            logger.info("👥 Adults: %s, Children: %s", intent.num_adults, intent.num_children)
+            logger.info("💰 Budget: %s", intent.total_budget)
+            logger.info(_SEP)
+
+        state.add_message(
             f"Search Orchestrator: Searching for flights and hotels..."
         )
 
         try:
-            # Run searches in parallel
-            flight_task = asyncio.create_task(
-                self._search_flights_async(intent)
-            )
-            hotel_task = asyncio.create_task(
-                self.hotel_service.search_hotels(intent, max_results=20)
-            )
-
-            # Wait for both to complete
-            flight_results, hotel_results = await asyncio.gather(
-                flight_task,
-                hotel_task,
-                return_exceptions=True
-            )
+            # Run fetch+optimize pipelines in parallel - each result set is
+            # optimized the moment its own API call returns, instead of
+            # waiting for both fetches before any optimization starts.
+            # TaskGroup gives structured cancellation; the semaphore caps
+            # outbound API concurrency; the timeout bounds the whole fan-out.
+            async with asyncio.timeout(settings.search_timeout_seconds):
+                async with asyncio.TaskGroup() as tg:
+                    flight_task = tg.create_task(
+                        _bounded(_OUTBOUND_SEMAPHORE, self._fetch_and_optimize_flights(intent))
+                    )
+                    hotel_task = tg.create_task(
+                        _bounded(_OUTBOUND_SEMAPHORE, self._fetch_and_optimize_hotels(intent))
+                    )
+
+            flight_results = flight_task.result()
+            hotel_results = hotel_task.result()
 
             # Handle results
             if isinstance(flight_results, Exception):
-                logger.error(f"❌ Flight search failed: {flight_results}")
+                logger.error("❌ Flight search failed: %s", flight_results)
                 state.errors.append(f"Flight search error: {str(flight_results)}")
                 state.flight_options = []
             else:
-                logger.info(f"✅ Raw flight results: {len(flight_results)} flights before optimization")
                 state.flight_options = flight_results
 
             if isinstance(hotel_results, Exception):
-                logger.error(f"❌ Hotel search failed: {hotel_results}")
+                logger.error("❌ Hotel search failed: %s", hotel_results)
                 state.errors.append(f"Hotel search error: {str(hotel_results)}")
                 state.accommodation_options = []
             else:
-                logger.info(f"✅ Raw hotel results: {len(hotel_results)} hotels before optimization")
                 state.accommodation_options = hotel_results
 
-            # Filter and optimize results
-            state.flight_options = self._optimize_flights(
-                state.flight_options,
-                intent.total_budget
-            )
-            logger.info(f"✅ After optimization: {len(state.flight_options)} flights")
+            state.num_flights = len(state.flight_options)
+            state.num_hotels = len(state.accommodation_options)
 
-            state.accommodation_options = self._optimize_hotels(
-                state.accommodation_options,
-                intent.total_budget,
-                intent.travel_style.value if intent.travel_style else "balanced"
+            logger.info(_SEP)
+            logger.info("SEARCH ORCHESTRATOR COMPLETE")
+            logger.info(
+                "Final results: %d flights, %d hotels",
+                len(state.flight_options),
+                len(state.accommodation_options)
             )
-            logger.info(f"✅ After optimization: {len(state.accommodation_options)} hotels")
+            logger.info(_SEP)
 
-            logger.info(f"=" * 80)
-            logger.info(f"SEARCH ORCHESTRATOR COMPLETE")
-            logger.info(f"Final results: {len(state.flight_options)} flights, {len(state.accommodation_options)} hotels")
-            logger.info(f"=" * 80)
-
-            state.agent_messages.append(
+            state.add_message(
                 f"Search Orchestrator: Found {len(state.flight_options)} flights "
                 f"and {len(state.accommodation_options)} hotels"
             )
@@ -118,49 +205,99 @@ class SearchOrchestratorAgent:
             error_msg = f"Search Orchestrator Error: {str(e)}"
             logger.error(error_msg)
             state.errors.append(error_msg)
-            state.agent_messages.append(error_msg)
+            state.add_message(error_msg)
 
         return state
 
+    async def _fetch_and_optimize_flights(self, intent) -> List[FlightOption]:
+        """Fetch flights, then optimize as soon as results arrive"""
+        flights = await _cached_search(
+            _flight_cache,
+            _search_cache_key(intent, "flights"),
+            lambda: self._search_flights_async(intent)
+        )
+        logger.info("✅ Raw flight results: %d flights before optimization", len(flights))
+        # Score/sort in a worker thread so the event loop keeps serving
+        # other requests while we crunch
+        flights = await asyncio.to_thread(self._optimize_flights, flights, intent.total_budget)
+        logger.info("✅ After optimization: %d flights", len(flights))
+        return flights
+
+    async def _fetch_and_optimize_hotels(self, intent) -> List[AccommodationOption]:
+        """Fetch hotels, then optimize as soon as results arrive"""
+        hotels = await _cached_search(
+            _hotel_cache,
+            _search_cache_key(intent, "hotels"),
+            lambda: self.hotel_service.search_hotels(intent, max_results=20)
+        )
+        logger.info("✅ Raw hotel results: %d hotels before optimization", len(hotels))
+        hotels = await asyncio.to_thread(
+            self._optimize_hotels,
+            hotels,
+            intent.total_budget,
+            intent.travel_style.value if intent.travel_style else "balanced"
+        )
+        logger.info("✅ After optimization: %d hotels", len(hotels))
+        return hotels
+
+    # Seconds to wait on SerpAPI before firing the Amadeus hedge request
+    FLIGHT_HEDGE_DELAY = 1.5
+
+    @staticmethod
+    def _flights_from_task(task: asyncio.Task, source: str) -> List[FlightOption]:
+        """Extract flight results from a finished provider task, swallowing errors"""
+        try:
+            flights = task.result()
+        except Exception as e:
+            logger.warning("⚠️  %s failed: %s", source, e)
+            return []
+        if flights:
+            logger.info("✅ %s success: Found %d flights", source, len(flights))
+            return flights
+        logger.warning("⚠️  %s returned 0 flights", source)
+        return []
+
     async def _search_flights_async(self, intent) -> List[FlightOption]:
         """
-        Async wrapper for flight search with fallback strategy:
-        1. Try SerpAPI (Google Flights scraper) - most reliable
-        2. Fall back to Amadeus if SerpAPI fails
+        Flight search with a hedged fallback strategy:
+        1. Fire SerpAPI (Google Flights scraper) immediately - most reliable
+        2. If it is slow or comes back empty, race Amadeus in parallel and
+           take the first provider that returns non-empty results
         """
-        flights = []
+        logger.info("🔍 Trying SerpAPI (Google Flights)...")
+        serp_task = asyncio.ensure_future(
+            _run_blocking(self.serpapi_service.search_flights, intent, 15)
+        )
 
-        # Try SerpAPI first (Google Flights)
-        try:
-            logger.info("🔍 Trying SerpAPI (Google Flights)...")
-            flights = await asyncio.to_thread(
-                self.serpapi_service.search_flights,
-                intent,
-                max_results=15
-            )
+        # Give the primary a head start before paying for the hedge
+        done, _ = await asyncio.wait({serp_task}, timeout=self.FLIGHT_HEDGE_DELAY)
+        if serp_task in done:
+            flights = self._flights_from_task(serp_task, "SerpAPI")
             if flights:
-                logger.info(f"✅ SerpAPI success: Found {len(flights)} flights")
                 return flights
-            logger.warning("⚠️  SerpAPI returned 0 flights, trying Amadeus...")
-        except Exception as e:
-            logger.warning(f"⚠️  SerpAPI failed: {e}, trying Amadeus...")
+        else:
+            logger.info("⏱️  SerpAPI still pending after %ss, hedging with Amadeus...", self.FLIGHT_HEDGE_DELAY)
 
-        # Fallback to Amadeus
-        try:
-            logger.info("🔍 Trying Amadeus...")
-            flights = await asyncio.to_thread(
-                self.amadeus_service.search_flights,
-                intent,
-                max_results=15
-            )
-            if flights:
-                logger.info(f"✅ Amadeus success: Found {len(flights)} flights")
-            else:
-                logger.error("❌ Both SerpAPI and Amadeus returned 0 flights")
-        except Exception as e:
-            logger.error(f"❌ Amadeus also failed: {e}")
+        logger.info("🔍 Trying Amadeus...")
+        amadeus_task = asyncio.ensure_future(
+            self.amadeus_service.search_flights_async(intent, 15)
+        )
 
-        return flights
+        pending = {t for t in (serp_task, amadeus_task) if not t.done()}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer SerpAPI when both land in the same wake-up
+            for task, source in ((serp_task, "SerpAPI"), (amadeus_task, "Amadeus")):
+                if task in done:
+                    flights = self._flights_from_task(task, source)
+                    if flights:
+                        # Soft-cancel the loser; its thread result is discarded
+                        for other in pending:
+                            other.cancel()
+                        return flights
+
+        logger.error("❌ Both SerpAPI and Amadeus returned 0 flights")
+        return []
 
     def _optimize_flights(
         self,
@@ -174,27 +311,51 @@ class SearchOrchestratorAgent:
         if not flights:
             return []
 
-        # Filter by budget if specified
+        # Filter by budget if specified. One pass does the filtering while
+        # tracking the cheapest fare (for diagnostics) and the price/duration
+        # maxima the scorer needs, instead of three separate scans.
         if budget:
             # Assume 40% of budget for flights
             max_flight_cost = budget * 0.4
-            logger.info(f"💰 Budget filter: Max flight cost = {max_flight_cost} EUR (40% of {budget})")
+            logger.info("💰 Budget filter: Max flight cost = %s EUR (40%% of %s)", max_flight_cost, budget)
             flights_before_count = len(flights)
-            cheapest_price = min(f.total_price for f in flights) if flights else 0
-            flights = [f for f in flights if f.total_price <= max_flight_cost]
-            logger.info(f"💰 Budget filtered: {flights_before_count} -> {len(flights)} flights (cheapest: {cheapest_price} EUR)")
 
-            if not flights:
-                logger.warning(f"⚠️  All flights filtered out by budget! Need {cheapest_price} EUR but budget allows {max_flight_cost} EUR")
+            filtered = []
+            cheapest_price = float("inf")
+            max_price = 0.0
+            max_duration = 0
+            for f in flights:
+                price = f.total_price
+                if price < cheapest_price:
+                    cheapest_price = price
+                if price <= max_flight_cost:
+                    filtered.append(f)
+                    if price > max_price:
+                        max_price = price
+                    if f.total_duration_minutes > max_duration:
+                        max_duration = f.total_duration_minutes
+
+            if not filtered:
+                logger.warning("⚠️  All flights filtered out by budget! Need %s EUR but budget allows %s EUR", cheapest_price, max_flight_cost)
                 return []
 
+            logger.info("💰 Budget filtered: %d -> %d flights (cheapest: %s EUR)", flights_before_count, len(filtered), cheapest_price)
+            flights = filtered
+            max_price = max_price or 1
+            max_duration = max_duration or 1
+        else:
+            # Precompute normalization maxima once - recomputing them inside
+            # the scoring function made scoring O(N^2)
+            max_price = max(f.total_price for f in flights) or 1
+            max_duration = max(f.total_duration_minutes for f in flights) or 1
+
         # Score each flight
         def score_flight(flight: FlightOption) -> float:
             # Normalize price (lower is better)
-            price_score = 1 - (flight.total_price / max(f.total_price for f in flights))
+            price_score = 1 - (flight.total_price / max_price)
 
             # Normalize duration (shorter is better)
-            duration_score = 1 - (flight.total_duration_minutes / max(f.total_duration_minutes for f in flights))
+            duration_score = 1 - (flight.total_duration_minutes / max_duration)
 
             # Stops penalty (fewer is better)
             stops_score = 1 - (flight.number_of_stops / 3)  # 3+ stops = 0 score
@@ -202,12 +363,9 @@ class SearchOrchestratorAgent:
             # Weighted combination
             return (price_score * 0.5) + (duration_score * 0.3) + (stops_score * 0.2)
 
-        # Sort by score
-        flights_with_scores = [(f, score_flight(f)) for f in flights]
-        flights_with_scores.sort(key=lambda x: x[1], reverse=True)
-
-        # Return top options (keep variety)
-        return [f for f, _ in flights_with_scores[:10]]
+        # Top options by score (keep variety) - O(N log K) partial selection
+        # instead of a full sort plus slice
+        return heapq.nlargest(10, flights, key=score_flight)
 
     def _optimize_hotels(
         self,
@@ -228,10 +386,16 @@ class SearchOrchestratorAgent:
             max_hotel_budget = budget * 0.4
             hotels = [h for h in hotels if h.total_price <= max_hotel_budget]
 
+            if not hotels:
+                logger.warning("⚠️  All hotels filtered out by budget! Budget allows %s EUR", max_hotel_budget)
+                return []
+
+        # Precompute normalization maximum once instead of per scored hotel
+        max_price = max(h.total_price for h in hotels) or 1
+
         # Score each hotel
         def score_hotel(hotel: AccommodationOption) -> float:
             # Normalize price (lower is better for budget style, higher OK for luxury)
-            max_price = max(h.total_price for h in hotels) or 1
             if style in ["budget", "backpacker"]:
                 price_score = 1 - (hotel.total_price / max_price)
             elif style in ["luxury", "comfort"]:
@@ -269,29 +433,104 @@ class SearchOrchestratorAgent:
         hotels_with_scores = [(h, score_hotel(h)) for h in hotels]
         hotels_with_scores.sort(key=lambda x: x[1], reverse=True)
 
-        # Return top options with variety (different price points)
-        selected_hotels = []
+        # Return top options with variety (different price points).
+        # Single pass with per-bucket caps: stop as soon as all buckets are
+        # full instead of classifying the whole sorted list
+        bucket_caps = {"low": 4, "mid": 4, "high": 2}
         price_ranges = {"low": [], "mid": [], "high": []}
 
         for hotel, score in hotels_with_scores:
             if hotel.price_per_night < 100:
-                price_ranges["low"].append(hotel)
+                bucket = "low"
             elif hotel.price_per_night < 200:
-                price_ranges["mid"].append(hotel)
+                bucket = "mid"
             else:
-                price_ranges["high"].append(hotel)
+                bucket = "high"
 
-        # Take best from each range
-        selected_hotels.extend(price_ranges["low"][:4])
-        selected_hotels.extend(price_ranges["mid"][:4])
-        selected_hotels.extend(price_ranges["high"][:2])
+            if len(price_ranges[bucket]) < bucket_caps[bucket]:
+                price_ranges[bucket].append(hotel)
+                if all(len(price_ranges[b]) >= bucket_caps[b] for b in bucket_caps):
+                    break
 
-        return selected_hotels[:15]
+        # Best from each range, already capped above
+        return price_ranges["low"] + price_ranges["mid"] + price_ranges["high"]
+
+
+# Lazy module-level singleton so API service clients (and their HTTP
+# connection pools) survive across graph invocations
+_search_agent_singleton: SearchOrchestratorAgent | None = None
+_search_agent_lock = threading.Lock()
+
+
+def get_search_orchestrator_agent() -> SearchOrchestratorAgent:
+    """Get (or lazily create) the shared SearchOrchestratorAgent instance"""
+    global _search_agent_singleton
+    if _search_agent_singleton is None:
+        with _search_agent_lock:
+            if _search_agent_singleton is None:
+                # Use real APIs (Amadeus hotels). Mock mode disabled since we have Amadeus working.
+                _search_agent_singleton = SearchOrchestratorAgent(use_mock_hotels=False)
+    return _search_agent_singleton
+
+
+async def close_search_orchestrator_agent() -> None:
+    """Close the shared agent's HTTP clients (application shutdown hook)"""
+    if _search_agent_singleton is not None:
+        await _search_agent_singleton.hotel_service.aclose()
 
 
 # Standalone async function for LangGraph node
 async def search_node(state: AgentState) -> AgentState:
     """LangGraph node wrapper for Search Orchestrator"""
-    # Use real APIs (Amadeus hotels). Mock mode disabled since we have Amadeus working.
-    agent = SearchOrchestratorAgent(use_mock_hotels=False)
+    agent = get_search_orchestrator_agent()
     return await agent.search(state)
+
+
+# Graph-level fan-out nodes. Each parallel branch returns a partial state
+# update touching only its own key, so LangGraph merges the branches
+# without reducers and the taste profiler can still replace the lists
+# when it trims them.
+async def search_flights_node(state: AgentState) -> dict:
+    """LangGraph node: flight leg of the parallel search fan-out"""
+    if not state.parsed_intent:
+        logger.error("Search Orchestrator: No parsed intent found")
+        return {"flight_options": []}
+
+    agent = get_search_orchestrator_agent()
+    try:
+        async with asyncio.timeout(settings.search_timeout_seconds):
+            async with _OUTBOUND_SEMAPHORE:
+                flights = await agent._fetch_and_optimize_flights(state.parsed_intent)
+    except Exception as e:
+        logger.error("❌ Flight search failed: %s", e)
+        # Surface the failure on the branch's own error channel so the
+        # client can tell a provider outage from a legitimate empty search
+        return {
+            "flight_options": [],
+            "flight_search_errors": [f"Flight search error: {str(e)}"],
+        }
+    return {
+        "flight_options": flights,
+        "num_flights": len(flights),
+        "current_step": "search_complete",
+    }
+
+
+async def search_hotels_node(state: AgentState) -> dict:
+    """LangGraph node: hotel leg of the parallel search fan-out"""
+    if not state.parsed_intent:
+        logger.error("Search Orchestrator: No parsed intent found")
+        return {"accommodation_options": []}
+
+    agent = get_search_orchestrator_agent()
+    try:
+        async with asyncio.timeout(settings.search_timeout_seconds):
+            async with _OUTBOUND_SEMAPHORE:
+                hotels = await agent._fetch_and_optimize_hotels(state.parsed_intent)
+    except Exception as e:
+        logger.error("❌ Hotel search failed: %s", e)
+        return {
+            "accommodation_options": [],
+            "hotel_search_errors": [f"Hotel search error: {str(e)}"],
+        }
+    return {"accommodation_options": hotels, "num_hotels": len(hotels)}
@@ -3,9 +3,13 @@ Synthesis Agent
 Creates 3 complete, curated itineraries from search results.
 Uses OpenAI GPT-4 for creative trip planning and reasoning.
 """
+import asyncio
+import functools
 import logging
-from typing import List
+import threading
+from typing import AsyncIterator, List
 from datetime import timedelta
+from operator import attrgetter
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from app.models.travel import (
@@ -20,6 +24,32 @@ from app.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Sort keys for option selection - attrgetter dispatches in C, unlike a
+# per-element Python lambda
+_FLIGHT_PRICE_KEY = attrgetter("total_price")
+_HOTEL_NIGHT_PRICE_KEY = attrgetter("price_per_night")
+_FLIGHT_CONVENIENCE_KEY = attrgetter("number_of_stops", "total_duration_minutes")
+
+# One ChatOpenAI client shared across SynthesisAgent instances, so every
+# graph invocation reuses the same pooled HTTP connections instead of
+# paying TCP/TLS setup per run
+_shared_llm: ChatOpenAI | None = None
+_shared_llm_lock = threading.Lock()
+
+
+def _get_shared_llm() -> ChatOpenAI:
+    """Get (or lazily create) the shared synthesis LLM client"""
+    global _shared_llm
+    if _shared_llm is None:
+        with _shared_llm_lock:
+            if _shared_llm is None:
+                _shared_llm = ChatOpenAI(
+                    model="gpt-4o-mini",
+                    api_key=settings.openai_api_key,
+                    temperature=0.7,  # More creative for itinerary generation
+                )
+    return _shared_llm
+
 
 class SynthesisAgent:
     """
@@ -28,11 +58,7 @@ class SynthesisAgent:
     """
 
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            api_key=settings.openai_api_key,
-            temperature=0.7,  # More creative for itinerary generation
-        )
+        self.llm = _get_shared_llm()
 
     async def synthesize(self, state: AgentState) -> AgentState:
         """
@@ -40,36 +66,25 @@ class SynthesisAgent:
         Creates 3 complete itineraries.
         """
         try:
-            state.agent_messages.append(
+            state.add_message(
                 "Synthesis Agent: Creating your personalized itineraries..."
             )
 
             if not state.flight_options or not state.accommodation_options:
                 error_msg = "Synthesis Agent: Insufficient search results"
                 state.errors.append(error_msg)
-                state.agent_messages.append(error_msg)
+                state.add_message(error_msg)
                 return state
 
-            # Create 3 different itinerary styles
-            itineraries = []
-
-            # 1. Budget-friendly option
-            budget_itinerary = await self._create_budget_itinerary(state)
-            if budget_itinerary:
-                itineraries.append(budget_itinerary)
-
-            # 2. Balanced option
-            balanced_itinerary = await self._create_balanced_itinerary(state)
-            if balanced_itinerary:
-                itineraries.append(balanced_itinerary)
-
-            # 3. Premium option
-            premium_itinerary = await self._create_premium_itinerary(state)
-            if premium_itinerary:
-                itineraries.append(premium_itinerary)
+            # Collect from the streaming path so both entry points share one
+            # implementation; streaming consumers get each itinerary as soon
+            # as its builder finishes instead of waiting for all three
+            itineraries = [
+                itinerary async for itinerary in self.synthesize_stream(state)
+            ]
 
             state.itineraries = itineraries
-            state.agent_messages.append(
+            state.add_message(
                 f"Synthesis Agent: Created {len(itineraries)} complete itineraries"
             )
             state.current_step = "synthesis_complete"
@@ -78,186 +93,189 @@ class SynthesisAgent:
             error_msg = f"Synthesis Agent Error: {str(e)}"
             logger.error(error_msg, exc_info=True)
             state.errors.append(error_msg)
-            state.agent_messages.append(error_msg)
+            state.add_message(error_msg)
 
         return state
 
-    async def _create_budget_itinerary(self, state: AgentState) -> Itinerary | None:
-        """Create budget-friendly itinerary option"""
-        try:
-            # Select cheapest flight
-            flights = sorted(state.flight_options, key=lambda f: f.total_price)
-            if not flights:
-                return None
-            selected_flight = flights[0]
-
-            # Select cheapest hotel with decent rating for budget option
-            hotels = sorted(
-                state.accommodation_options,
-                key=lambda h: h.price_per_night  # Sort by price, cheapest first
-            )
-            if not hotels:
-                return None
-
-            # Select the cheapest hotel for budget
-            selected_hotels = [hotels[0]] if hotels else []
-
-            # Skip daily plans initially - will be generated after user selects interests
-            daily_plans = []
-
-            # Calculate costs
-            flight_cost = selected_flight.total_price
-            accommodation_cost = sum(h.total_price for h in selected_hotels)
-            # Activities cost will be calculated after user selects interests
-            activities_cost = 0
-            food_cost = (state.parsed_intent.duration_days or 7) * 40 * (
-                state.parsed_intent.num_adults + state.parsed_intent.num_children
-            )
+    async def synthesize_stream(self, state: AgentState) -> AsyncIterator[Itinerary]:
+        """
+        Yield itineraries in completion order.
+        Each builder runs as its own task and is yielded the moment it
+        finishes, so a streaming consumer (SSE/WebSocket) can show the
+        first card without waiting for the other two.
+        """
+        if not state.flight_options or not state.accommodation_options:
+            return
+
+        # All sorting and option selection happens once, up front; the
+        # builders are pure constructors indexing these results
+        flights = state.flight_options
+        flights_by_price = sorted(flights, key=_FLIGHT_PRICE_KEY)
+        hotels_by_price = sorted(
+            state.accommodation_options, key=_HOTEL_NIGHT_PRICE_KEY
+        )
 
-            # Calculate duration safely
-            duration = state.parsed_intent.duration_days or 7
-
-            return Itinerary(
-                title=f"Budget Option - {state.parsed_intent.destination}",
-                summary=f"Smart spending without missing out. This {duration}-day trip maximizes experiences while keeping costs down.",
-                style_tag="Budget",
-                flights=selected_flight,
-                accommodations=selected_hotels,
-                daily_plans=daily_plans,
-                flight_cost=flight_cost,
-                accommodation_cost=accommodation_cost,
-                activities_cost=activities_cost,
-                estimated_food_cost=food_cost,
-                total_cost=flight_cost + accommodation_cost + activities_cost + food_cost,
-                why_this_option="This itinerary prioritizes value and authentic experiences. You'll stay in well-rated, centrally-located accommodations that free up budget for memorable activities and local food.",
-                tradeoffs="To stay within budget, flights may include connections and hotels focus on location over luxury amenities. Perfect for travelers who prefer spending on experiences rather than lodging."
-            )
+        # Best convenience for premium (fewest stops, best times)
+        flights_by_convenience = sorted(flights, key=_FLIGHT_CONVENIENCE_KEY)
+
+        # Mid-range flight for balanced (good balance of price and
+        # convenience). The score column is computed once, clamping the
+        # denominator - the old 24 - stops * 8 divisor hit zero for
+        # 3-stop flights
+        balanced_scores = [
+            f.total_price / max(1, 24 - f.number_of_stops * 8)  # Penalize stops
+            for f in flights
+        ]
+        order = sorted(range(len(flights)), key=balanced_scores.__getitem__)
+        balanced_flight = flights[order[len(order) // 2]]  # Middle option
+
+        # Mid-range hotel for balanced (middle option by price).
+        # If only 2 hotels, pick the cheaper one (to differentiate from luxury)
+        if len(hotels_by_price) == 2:
+            mid_index = 0  # Pick cheaper one
+        else:
+            mid_index = len(hotels_by_price) // 2
+
+        tasks = [
+            asyncio.create_task(
+                self._create_budget_itinerary(
+                    state, flights_by_price[0], [hotels_by_price[0]]
+                )
+            ),
+            asyncio.create_task(
+                self._create_balanced_itinerary(
+                    state, balanced_flight, [hotels_by_price[mid_index]]
+                )
+            ),
+            asyncio.create_task(
+                self._create_premium_itinerary(
+                    state, flights_by_convenience[0], [hotels_by_price[-1]]
+                )
+            ),
+        ]
+
+        for completed in asyncio.as_completed(tasks):
+            try:
+                itinerary = await completed
+            except Exception as e:
+                logger.error(f"Itinerary creation failed: {e}")
+                continue
+            if itinerary:
+                yield itinerary
+
+    async def _create_budget_itinerary(
+        self,
+        state: AgentState,
+        selected_flight: FlightOption,
+        selected_hotels: List[AccommodationOption],
+    ) -> Itinerary | None:
+        """Create budget-friendly itinerary option (cheapest flight and hotel)"""
+        # Skip daily plans initially - will be generated after user selects interests
+        daily_plans = []
 
-        except Exception as e:
-            logger.error(f"Budget itinerary creation failed: {e}")
-            return None
+        # Calculate costs
+        flight_cost = selected_flight.total_price
+        accommodation_cost = sum(h.total_price for h in selected_hotels)
+        # Activities cost will be calculated after user selects interests
+        activities_cost = 0
+        food_cost = (state.parsed_intent.duration_days or 7) * 40 * (
+            state.parsed_intent.num_adults + state.parsed_intent.num_children
+        )
 
-    async def _create_balanced_itinerary(self, state: AgentState) -> Itinerary | None:
-        """Create balanced itinerary option"""
-        try:
-            # Select mid-range flight (good balance of price and convenience)
-            flights = sorted(
-                state.flight_options,
-                key=lambda f: f.total_price / (24 - f.number_of_stops * 8)  # Penalize stops
-            )
-            if not flights:
-                return None
-            selected_flight = flights[len(flights) // 2]  # Middle option
-
-            # Select mid-range hotel (middle option by price)
-            hotels_by_price = sorted(
-                state.accommodation_options,
-                key=lambda h: h.price_per_night
-            )
-            if not hotels_by_price:
-                return None
-
-            # Pick the middle-priced hotel for balanced option
-            # If only 2 hotels, pick the cheaper one (to differentiate from luxury)
-            if len(hotels_by_price) == 2:
-                mid_index = 0  # Pick cheaper one
-            else:
-                mid_index = len(hotels_by_price) // 2
-            selected_hotels = [hotels_by_price[mid_index]] if hotels_by_price else []
-
-            # Skip daily plans initially - will be generated after user selects interests
-            daily_plans = []
-
-            # Calculate costs
-            flight_cost = selected_flight.total_price
-            accommodation_cost = sum(h.total_price for h in selected_hotels)
-            # Activities cost will be calculated after user selects interests
-            activities_cost = 0
-            food_cost = (state.parsed_intent.duration_days or 7) * 60 * (
-                state.parsed_intent.num_adults + state.parsed_intent.num_children
-            )
+        # Calculate duration safely
+        duration = state.parsed_intent.duration_days or 7
+
+        return Itinerary.model_construct(
+            title=f"Budget Option - {state.parsed_intent.destination}",
+            summary=f"Smart spending without missing out. This {duration}-day trip maximizes experiences while keeping costs down.",
+            style_tag="Budget",
+            flights=selected_flight,
+            accommodations=selected_hotels,
+            daily_plans=daily_plans,
+            flight_cost=flight_cost,
+            accommodation_cost=accommodation_cost,
+            activities_cost=activities_cost,
+            estimated_food_cost=food_cost,
+            total_cost=flight_cost + accommodation_cost + activities_cost + food_cost,
+            why_this_option="This itinerary prioritizes value and authentic experiences. You'll stay in well-rated, centrally-located accommodations that free up budget for memorable activities and local food.",
+            tradeoffs="To stay within budget, flights may include connections and hotels focus on location over luxury amenities. Perfect for travelers who prefer spending on experiences rather than lodging."
+        )
 
-            # Calculate duration safely
-            duration = state.parsed_intent.duration_days or 7
-
-            return Itinerary(
-                title=f"Balanced Option - {state.parsed_intent.destination}",
-                summary=f"The sweet spot between comfort and adventure. {duration} days of well-paced exploration with quality accommodations.",
-                style_tag="Balanced Family",
-                flights=selected_flight,
-                accommodations=selected_hotels,
-                daily_plans=daily_plans,
-                flight_cost=flight_cost,
-                accommodation_cost=accommodation_cost,
-                activities_cost=activities_cost,
-                estimated_food_cost=food_cost,
-                total_cost=flight_cost + accommodation_cost + activities_cost + food_cost,
-                why_this_option="This itinerary strikes the perfect balance - comfortable flights, well-located hotels with good amenities, and a mix of must-see attractions with local experiences.",
-                tradeoffs="Mid-range pricing means good value without extremes. You get comfort and convenience while leaving room in your budget for spontaneous discoveries."
-            )
+    async def _create_balanced_itinerary(
+        self,
+        state: AgentState,
+        selected_flight: FlightOption,
+        selected_hotels: List[AccommodationOption],
+    ) -> Itinerary | None:
+        """Create balanced itinerary option (mid-range flight and hotel)"""
+        # Skip daily plans initially - will be generated after user selects interests
+        daily_plans = []
 
-        except Exception as e:
-            logger.error(f"Balanced itinerary creation failed: {e}")
-            return None
+        # Calculate costs
+        flight_cost = selected_flight.total_price
+        accommodation_cost = sum(h.total_price for h in selected_hotels)
+        # Activities cost will be calculated after user selects interests
+        activities_cost = 0
+        food_cost = (state.parsed_intent.duration_days or 7) * 60 * (
+            state.parsed_intent.num_adults + state.parsed_intent.num_children
+        )
 
-    async def _create_premium_itinerary(self, state: AgentState) -> Itinerary | None:
-        """Create premium itinerary option"""
-        try:
-            # Select best flights (fewest stops, best times)
-            flights = sorted(
-                state.flight_options,
-                key=lambda f: (f.number_of_stops, f.total_duration_minutes)
-            )
-            if not flights:
-                return None
-            selected_flight = flights[0]
-
-            # Select most expensive hotel (assuming higher price = luxury)
-            hotels_by_price = sorted(
-                state.accommodation_options,
-                key=lambda h: h.price_per_night,
-                reverse=True  # Most expensive first
-            )
-            if not hotels_by_price:
-                return None
-
-            # Pick the most expensive hotel for luxury option
-            selected_hotels = [hotels_by_price[0]] if hotels_by_price else []
-
-            # Skip daily plans initially - will be generated after user selects interests
-            daily_plans = []
-
-            # Calculate costs
-            flight_cost = selected_flight.total_price
-            accommodation_cost = sum(h.total_price for h in selected_hotels)
-            # Activities cost will be calculated after user selects interests
-            activities_cost = 0
-            food_cost = (state.parsed_intent.duration_days or 7) * 100 * (
-                state.parsed_intent.num_adults + state.parsed_intent.num_children
-            )
+        # Calculate duration safely
+        duration = state.parsed_intent.duration_days or 7
+
+        return Itinerary.model_construct(
+            title=f"Balanced Option - {state.parsed_intent.destination}",
+            summary=f"The sweet spot between comfort and adventure. {duration} days of well-paced exploration with quality accommodations.",
+            style_tag="Balanced Family",
+            flights=selected_flight,
+            accommodations=selected_hotels,
+            daily_plans=daily_plans,
+            flight_cost=flight_cost,
+            accommodation_cost=accommodation_cost,
+            activities_cost=activities_cost,
+            estimated_food_cost=food_cost,
+            total_cost=flight_cost + accommodation_cost + activities_cost + food_cost,
+            why_this_option="This itinerary strikes the perfect balance - comfortable flights, well-located hotels with good amenities, and a mix of must-see attractions with local experiences.",
+            tradeoffs="Mid-range pricing means good value without extremes. You get comfort and convenience while leaving room in your budget for spontaneous discoveries."
+        )
 
-            # Calculate duration safely
-            duration = state.parsed_intent.duration_days or 7
-
-            return Itinerary(
-                title=f"Luxury Option - {state.parsed_intent.destination}",
-                summary=f"Elevated travel with every detail perfected. {duration} days of luxury accommodations, seamless logistics, and curated experiences.",
-                style_tag="Luxury",
-                flights=selected_flight,
-                accommodations=selected_hotels,
-                daily_plans=daily_plans,
-                flight_cost=flight_cost,
-                accommodation_cost=accommodation_cost,
-                activities_cost=activities_cost,
-                estimated_food_cost=food_cost,
-                total_cost=flight_cost + accommodation_cost + activities_cost + food_cost,
-                why_this_option="This itinerary prioritizes comfort, convenience, and memorable experiences. Direct flights, top-rated hotels with excellent amenities, and premium activities that showcase the destination's finest offerings.",
-                tradeoffs="Higher investment in quality means less budget flexibility, but delivers stress-free travel with elevated experiences throughout your journey."
-            )
+    async def _create_premium_itinerary(
+        self,
+        state: AgentState,
+        selected_flight: FlightOption,
+        selected_hotels: List[AccommodationOption],
+    ) -> Itinerary | None:
+        """Create premium itinerary option (most convenient flight, top hotel)"""
+        # Skip daily plans initially - will be generated after user selects interests
+        daily_plans = []
 
-        except Exception as e:
-            logger.error(f"Premium itinerary creation failed: {e}")
-            return None
+        # Calculate costs
+        flight_cost = selected_flight.total_price
+        accommodation_cost = sum(h.total_price for h in selected_hotels)
+        # Activities cost will be calculated after user selects interests
+        activities_cost = 0
+        food_cost = (state.parsed_intent.duration_days or 7) * 100 * (
+            state.parsed_intent.num_adults + state.parsed_intent.num_children
+        )
+
+        # Calculate duration safely
+        duration = state.parsed_intent.duration_days or 7
+
+        return Itinerary.model_construct(
+            title=f"Luxury Option - {state.parsed_intent.destination}",
+            summary=f"Elevated travel with every detail perfected. {duration} days of luxury accommodations, seamless logistics, and curated experiences.",
+            style_tag="Luxury",
+            flights=selected_flight,
+            accommodations=selected_hotels,
+            daily_plans=daily_plans,
+            flight_cost=flight_cost,
+            accommodation_cost=accommodation_cost,
+            activities_cost=activities_cost,
+            estimated_food_cost=food_cost,
+            total_cost=flight_cost + accommodation_cost + activities_cost + food_cost,
+            why_this_option="This itinerary prioritizes comfort, convenience, and memorable experiences. Direct flights, top-rated hotels with excellent amenities, and premium activities that showcase the destination's finest offerings.",
+            tradeoffs="Higher investment in quality means less budget flexibility, but delivers stress-free travel with elevated experiences throughout your journey."
+        )
 
     def _select_hotels_for_trip(
         self,
@@ -310,7 +328,7 @@ For each day, provide realistic activities with variety and good pacing.""")
                 # Create sample activities based on style
                 activities = self._generate_sample_activities(day, style, intent)
 
-                daily_plan = DayPlan(
+                daily_plan = DayPlan.model_construct(
                     day_number=day,
                     date=current_date,
                     location=intent.destination or "Destination",
@@ -334,49 +352,73 @@ For each day, provide realistic activities with variety and good pacing.""")
         """Generate sample activities for MVP"""
         destination = intent.destination or "City"
 
-        base_activities = {
-            1: Activity(
-                name=f"Welcome to {destination} - City Walking Tour",
-                description="Orientation walk covering main landmarks and neighborhoods",
-                category="tour",
-                duration_hours=3,
-                price_per_person=15 if style == "budget" else 25,
-                location=f"{destination} Old Town",
-                rating=4.5,
-                suitable_for_children=True,
-                physical_intensity="low"
-            ),
-            2: Activity(
-                name=f"{destination} Main Attraction Visit",
-                description="Explore the city's iconic landmark or museum",
-                category="cultural",
-                duration_hours=4,
-                price_per_person=20 if style == "budget" else 40,
-                location=f"{destination} Center",
-                rating=4.7,
-                suitable_for_children=True,
-                physical_intensity="low"
-            ),
-            3: Activity(
-                name="Local Food Experience",
-                description="Food tour or cooking class featuring regional cuisine",
-                category="food",
-                duration_hours=3,
-                price_per_person=40 if style == "budget" else 80,
-                location=f"{destination} Market District",
-                rating=4.8,
-                suitable_for_children=True,
-                physical_intensity="low"
-            )
-        }
-
         # Return activity for this day (cycle through if more days than activities)
         activity_index = ((day_number - 1) % 3) + 1
-        return [base_activities[activity_index]]
+        return [_sample_activity(activity_index, style == "budget", destination)]
+
+
+@functools.lru_cache(maxsize=256)
+def _sample_activity(activity_index: int, budget: bool, destination: str) -> Activity:
+    """
+    Build (and cache) one of the three rotating sample activities.
+    Pydantic validation of identical data was previously repeated once per
+    trip day; the cache makes it once per (slot, style, destination).
+    """
+    if activity_index == 1:
+        return Activity(
+            name=f"Welcome to {destination} - City Walking Tour",
+            description="Orientation walk covering main landmarks and neighborhoods",
+            category="tour",
+            duration_hours=3,
+            price_per_person=15 if budget else 25,
+            location=f"{destination} Old Town",
+            rating=4.5,
+            suitable_for_children=True,
+            physical_intensity="low"
+        )
+    if activity_index == 2:
+        return Activity(
+            name=f"{destination} Main Attraction Visit",
+            description="Explore the city's iconic landmark or museum",
+            category="cultural",
+            duration_hours=4,
+            price_per_person=20 if budget else 40,
+            location=f"{destination} Center",
+            rating=4.7,
+            suitable_for_children=True,
+            physical_intensity="low"
+        )
+    return Activity(
+        name="Local Food Experience",
+        description="Food tour or cooking class featuring regional cuisine",
+        category="food",
+        duration_hours=3,
+        price_per_person=40 if budget else 80,
+        location=f"{destination} Market District",
+        rating=4.8,
+        suitable_for_children=True,
+        physical_intensity="low"
+    )
+
+
+# Lazy module-level singleton so each graph invocation reuses the same
+# agent instance instead of re-allocating one per run
+_synthesis_agent_singleton: SynthesisAgent | None = None
+_synthesis_agent_lock = threading.Lock()
+
+
+def get_synthesis_agent() -> SynthesisAgent:
+    """Get (or lazily create) the shared SynthesisAgent instance"""
+    global _synthesis_agent_singleton
+    if _synthesis_agent_singleton is None:
+        with _synthesis_agent_lock:
+            if _synthesis_agent_singleton is None:
+                _synthesis_agent_singleton = SynthesisAgent()
+    return _synthesis_agent_singleton
 
 
 # Standalone async function for LangGraph node
 async def synthesis_node(state: AgentState) -> AgentState:
     """LangGraph node wrapper for Synthesis Agent"""
-    agent = SynthesisAgent()
+    agent = get_synthesis_agent()
     return await agent.synthesize(state)
@@ -3,8 +3,12 @@ Taste Profiler Agent
 Scores travel options based on user's historical preferences and taste profile.
 For MVP: Uses simple heuristics. Phase 2 will add vector embeddings.
 """
+import functools
+import heapq
 import logging
-from typing import Dict, Any, List
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, List, Tuple
 from app.models.travel import (
     AgentState,
     FlightOption,
@@ -14,6 +18,49 @@ from app.models.travel import (
 
 logger = logging.getLogger(__name__)
 
+# Amenity lookup sets for hotel scoring - frozensets so the per-hotel checks
+# are hash intersections instead of nested list scans
+_FAMILY_AMENITIES = frozenset({"Kids Club", "Pool", "Family Room", "Playground"})
+_LUXURY_AMENITIES = frozenset({"Spa", "Concierge", "Pool", "Restaurant"})
+
+
+@dataclass(frozen=True, slots=True)
+class TasteProfile:
+    """
+    Immutable taste profile read by the scoring loops.
+    Slot attribute reads are direct C-level accesses, unlike the dict
+    lookups this replaces, and freezing it makes the profile safely
+    shareable across scoring passes.
+    """
+    preferred_styles: Tuple[str, ...] = ("balanced",)
+    budget_consciousness: str = "moderate"
+    time_sensitivity: str = "balanced"
+    comfort_level: str = "moderate"
+    accommodation_preferences: FrozenSet[str] = frozenset({"hotel"})
+    interests: Tuple[str, ...] = ()
+    past_destinations: Tuple[str, ...] = ()
+    preferred_airlines: FrozenSet[str] = frozenset()
+    preferred_hotel_chains: FrozenSet[str] = frozenset()
+    family_friendly: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TasteProfile":
+        """Build a profile from the stored dict shape (database rows)"""
+        return cls(
+            preferred_styles=tuple(data.get("preferred_styles") or ("balanced",)),
+            budget_consciousness=data.get("budget_consciousness", "moderate"),
+            time_sensitivity=data.get("time_sensitivity", "balanced"),
+            comfort_level=data.get("comfort_level", "moderate"),
+            accommodation_preferences=frozenset(
+                data.get("accommodation_preferences") or ("hotel",)
+            ),
+            interests=tuple(data.get("interests") or ()),
+            past_destinations=tuple(data.get("past_destinations") or ()),
+            preferred_airlines=frozenset(data.get("preferred_airlines") or ()),
+            preferred_hotel_chains=frozenset(data.get("preferred_hotel_chains") or ()),
+            family_friendly=bool(data.get("family_friendly", False)),
+        )
+
 
 class TasteProfilerAgent:
     """
@@ -30,36 +77,47 @@ class TasteProfilerAgent:
         Scores all options based on user taste.
         """
         try:
-            state.agent_messages.append(
+            state.add_message(
                 "Taste Profiler: Analyzing your preferences..."
             )
 
+            # Snapshot intent fields once - pydantic attribute access is far
+            # slower than a local read, and the scorers only need the budget
+            intent = state.parsed_intent
+            budget = intent.total_budget if intent else None
+            budget_threshold = budget * 0.4 if budget else None
+
             # Get or create user taste profile
-            taste_profile = state.user_taste_profile or self._create_default_profile(
-                state.parsed_intent
+            if state.user_taste_profile:
+                taste_profile = TasteProfile.from_dict(state.user_taste_profile)
+            else:
+                taste_profile = self._create_default_profile(intent)
+
+            # Score flights in one batch pass
+            scored_flights = self._score_flights(
+                state.flight_options, taste_profile, budget_threshold
             )
 
-            # Score flights
-            scored_flights = []
-            for flight in state.flight_options:
-                score = self._score_flight(flight, taste_profile, state.parsed_intent)
-                scored_flights.append((flight, score))
+            # Keep the top options by taste score - nlargest is O(n log k)
+            # versus a full sort when search returns hundreds of candidates
+            top_flights = heapq.nlargest(8, scored_flights, key=lambda x: x[1])
+            state.flight_options = [f for f, _ in top_flights]
 
-            # Sort by taste score and keep top options
-            scored_flights.sort(key=lambda x: x[1], reverse=True)
-            state.flight_options = [f for f, _ in scored_flights[:8]]
+            # Score hotels in one batch pass
+            scored_hotels = self._score_hotels(
+                state.accommodation_options, taste_profile, budget_threshold
+            )
 
-            # Score hotels
-            scored_hotels = []
-            for hotel in state.accommodation_options:
-                score = self._score_hotel(hotel, taste_profile, state.parsed_intent)
-                scored_hotels.append((hotel, score))
+            # Diversity selection only needs the best-scored candidates, so
+            # hand it a score-ordered pool of 3x the slots it fills
+            top_hotels = heapq.nlargest(36, scored_hotels, key=lambda x: x[1])
+            state.accommodation_options = self._select_diverse_hotels(top_hotels)
 
-            # Sort by taste score and keep diverse options
-            scored_hotels.sort(key=lambda x: x[1], reverse=True)
-            state.accommodation_options = self._select_diverse_hotels(scored_hotels)
+            # Keep the O(1) counters in step with the trimmed lists
+            state.num_flights = len(state.flight_options)
+            state.num_hotels = len(state.accommodation_options)
 
-            state.agent_messages.append(
+            state.add_message(
                 f"Taste Profiler: Ranked options based on your preferences"
             )
             state.current_step = "taste_profiled"
@@ -68,11 +126,11 @@ class TasteProfilerAgent:
             error_msg = f"Taste Profiler Error: {str(e)}"
             logger.error(error_msg)
             state.errors.append(error_msg)
-            state.agent_messages.append(error_msg)
+            state.add_message(error_msg)
 
         return state
 
-    def _create_default_profile(self, intent: TravelIntent | None) -> Dict[str, Any]:
+    def _create_default_profile(self, intent: TravelIntent | None) -> TasteProfile:
         """
         Create default taste profile from current intent.
         In production, this would load from database and merge with intent.
@@ -80,45 +138,65 @@ class TasteProfilerAgent:
         if not intent:
             return self._get_neutral_profile()
 
-        profile = {
-            "preferred_styles": [intent.travel_style.value] if intent.travel_style else ["balanced"],
-            "budget_consciousness": self._infer_budget_consciousness(intent),
-            "time_sensitivity": "balanced",  # prefer faster vs. cheaper flights
-            "comfort_level": self._infer_comfort_level(intent),
-            "accommodation_preferences": intent.accommodation_type or ["hotel"],
-            "interests": intent.interests or [],
-            "past_destinations": [],
-            "preferred_airlines": [],
-            "preferred_hotel_chains": [],
-            "family_friendly": intent.num_children > 0,
-        }
-
-        return profile
-
-    def _get_neutral_profile(self) -> Dict[str, Any]:
+        # Read intent fields into locals once; the inference helpers take
+        # these primitives instead of re-walking the model
+        style = intent.travel_style.value if intent.travel_style else "balanced"
+        travelers = intent.num_adults + intent.num_children
+        days = intent.duration_days or 7
+
+        return self._build_profile_cached(
+            style,
+            intent.total_budget,
+            days,
+            travelers,
+            intent.num_children,
+            tuple(intent.accommodation_type or ("hotel",)),
+            tuple(intent.interests or ()),
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _build_profile_cached(
+        style: str,
+        total_budget: float | None,
+        days: int,
+        travelers: int,
+        num_children: int,
+        accommodation: Tuple[str, ...],
+        interests: Tuple[str, ...],
+    ) -> TasteProfile:
+        """
+        Build (and memoize) the profile for one combination of intent
+        fields. The derivation is deterministic, so repeat intents - the
+        same request re-profiled, or similar traffic across users - reuse
+        the frozen instance instead of re-inferring.
+        """
+        return TasteProfile(
+            preferred_styles=(style,),
+            budget_consciousness=TasteProfilerAgent._infer_budget_consciousness(
+                total_budget, days, travelers
+            ),
+            time_sensitivity="balanced",  # prefer faster vs. cheaper flights
+            comfort_level=TasteProfilerAgent._infer_comfort_level(style),
+            accommodation_preferences=frozenset(accommodation),
+            interests=interests,
+            family_friendly=num_children > 0,
+        )
+
+    def _get_neutral_profile(self) -> TasteProfile:
         """Neutral profile for users without history"""
-        return {
-            "preferred_styles": ["balanced"],
-            "budget_consciousness": "moderate",
-            "time_sensitivity": "balanced",
-            "comfort_level": "moderate",
-            "accommodation_preferences": ["hotel"],
-            "interests": [],
-            "past_destinations": [],
-            "preferred_airlines": [],
-            "preferred_hotel_chains": [],
-            "family_friendly": False,
-        }
-
-    def _infer_budget_consciousness(self, intent: TravelIntent) -> str:
+        return TasteProfile()
+
+    @staticmethod
+    def _infer_budget_consciousness(
+        total_budget: float | None, days: int, travelers: int
+    ) -> str:
         """Infer how budget-conscious the user is"""
-        if not intent.total_budget:
+        if not total_budget:
             return "moderate"
 
         # Simple heuristic: budget per person per day
-        days = intent.duration_days or 7
-        travelers = intent.num_adults + intent.num_children
-        budget_per_person_per_day = intent.total_budget / (days * travelers) if travelers > 0 else 0
+        budget_per_person_per_day = total_budget / (days * travelers) if travelers > 0 else 0
 
         if budget_per_person_per_day < 100:
             return "high"  # Very budget-conscious
@@ -127,112 +205,126 @@ class TasteProfilerAgent:
         else:
             return "moderate"
 
-    def _infer_comfort_level(self, intent: TravelIntent) -> str:
+    @staticmethod
+    def _infer_comfort_level(style: str) -> str:
         """Infer desired comfort level"""
-        if intent.travel_style.value in ["luxury", "relaxed"]:
+        if style in ["luxury", "relaxed"]:
             return "high"
-        elif intent.travel_style.value in ["adventure", "budget"]:
+        elif style in ["adventure", "budget"]:
             return "low"
         else:
             return "moderate"
 
-    def _score_flight(
+    def _score_flights(
         self,
-        flight: FlightOption,
-        profile: Dict[str, Any],
-        intent: TravelIntent | None
-    ) -> float:
+        flights: List[FlightOption],
+        profile: TasteProfile,
+        budget_threshold: float | None
+    ) -> List[tuple]:
         """
-        Score a flight option based on taste profile.
-        Returns score 0-1 (higher is better match).
+        Score all flight options in one pass.
+        Profile branches are resolved once up front so the per-flight work
+        is plain arithmetic - batch scoring keeps interpreter overhead flat
+        as option counts grow. Scores are 0-1 (higher is better match).
         """
-        score = 0.5  # Start with neutral
-
-        # Time sensitivity
-        if profile["time_sensitivity"] == "high":
+        # Map stop count -> bonus once, instead of re-branching per flight
+        time_sensitivity = profile.time_sensitivity
+        if time_sensitivity == "high":
             # Penalize long flights and connections
-            if flight.number_of_stops == 0:
-                score += 0.3
-            elif flight.number_of_stops == 1:
-                score += 0.1
-            else:
-                score -= 0.1
-        elif profile["time_sensitivity"] == "low":
+            stop_bonus = {0: 0.3, 1: 0.1}
+            default_stop_bonus = -0.1
+        elif time_sensitivity == "low":
             # Don't mind connections if price is good
-            if flight.number_of_stops >= 1:
-                score += 0.1
-
-        # Budget consciousness
-        if intent and intent.total_budget:
-            price_ratio = flight.total_price / (intent.total_budget * 0.4)
-            if profile["budget_consciousness"] == "high":
-                # Prefer cheaper flights
-                score += max(0, 0.3 - price_ratio * 0.3)
-            elif profile["budget_consciousness"] == "low":
-                # OK with spending more for quality
-                score += 0.1
-
-        # Comfort (booking class preference)
-        if profile["comfort_level"] == "high" and flight.outbound_segments[0].booking_class != "economy":
-            score += 0.2
+            stop_bonus = {0: 0.0}
+            default_stop_bonus = 0.1
+        else:
+            stop_bonus = {}
+            default_stop_bonus = 0.0
+
+        budget_consciousness = profile.budget_consciousness
+        comfort_high = profile.comfort_level == "high"
+        preferred_airlines = profile.preferred_airlines
+
+        scored = []
+        for flight in flights:
+            score = 0.5 + stop_bonus.get(flight.number_of_stops, default_stop_bonus)
+
+            # Budget consciousness
+            if budget_threshold:
+                if budget_consciousness == "high":
+                    # Prefer cheaper flights
+                    score += max(0, 0.3 - (flight.total_price / budget_threshold) * 0.3)
+                elif budget_consciousness == "low":
+                    # OK with spending more for quality
+                    score += 0.1
+
+            # Comfort (booking class preference)
+            if comfort_high and flight.outbound_segments[0].booking_class != "economy":
+                score += 0.2
 
-        # Preferred airlines
-        carriers = set(seg.carrier for seg in flight.outbound_segments + flight.return_segments)
-        if profile["preferred_airlines"]:
-            if any(carrier in profile["preferred_airlines"] for carrier in carriers):
+            # Preferred airlines
+            if preferred_airlines and (flight.carriers_set & preferred_airlines):
                 score += 0.15
 
-        return min(1.0, max(0.0, score))
+            scored.append((flight, min(1.0, max(0.0, score))))
+
+        return scored
 
-    def _score_hotel(
+    def _score_hotels(
         self,
-        hotel: AccommodationOption,
-        profile: Dict[str, Any],
-        intent: TravelIntent | None
-    ) -> float:
+        hotels: List[AccommodationOption],
+        profile: TasteProfile,
+        budget_threshold: float | None
+    ) -> List[tuple]:
         """
-        Score a hotel option based on taste profile.
-        Returns score 0-1 (higher is better match).
+        Score all hotel options in one pass.
+        Same batch structure as _score_flights: profile lookups hoisted out
+        of the loop. Scores are 0-1 (higher is better match).
         """
-        score = 0.5  # Start with neutral
-
-        # Type preference
-        if hotel.type in profile["accommodation_preferences"]:
-            score += 0.2
-
-        # Family-friendly
-        if profile["family_friendly"]:
-            family_amenities = ["Kids Club", "Pool", "Family Room", "Playground"]
-            if any(amenity in hotel.amenities for amenity in family_amenities):
+        accommodation_preferences = profile.accommodation_preferences
+        family_friendly = profile.family_friendly
+        comfort_level = profile.comfort_level
+        budget_conscious = profile.budget_consciousness == "high"
+
+        scored = []
+        for hotel in hotels:
+            score = 0.5  # Start with neutral
+            amenities = frozenset(hotel.amenities)
+
+            # Type preference
+            if hotel.type in accommodation_preferences:
                 score += 0.2
 
-        # Comfort level
-        if profile["comfort_level"] == "high":
-            if hotel.rating and hotel.rating >= 4.5:
+            # Family-friendly
+            if family_friendly and (_FAMILY_AMENITIES & amenities):
                 score += 0.2
-            luxury_amenities = ["Spa", "Concierge", "Pool", "Restaurant"]
-            if sum(1 for amenity in luxury_amenities if amenity in hotel.amenities) >= 2:
-                score += 0.1
-        elif profile["comfort_level"] == "low":
-            # Budget travelers care less about amenities
-            if hotel.price_per_night < 100:
-                score += 0.15
 
-        # Budget consciousness
-        if intent and intent.total_budget:
-            price_ratio = hotel.total_price / (intent.total_budget * 0.4)
-            if profile["budget_consciousness"] == "high":
-                score += max(0, 0.3 - price_ratio * 0.3)
-
-        # Rating boost
-        if hotel.rating:
-            score += (hotel.rating / 5.0) * 0.15
+            # Comfort level
+            if comfort_level == "high":
+                if hotel.rating and hotel.rating >= 4.5:
+                    score += 0.2
+                if len(_LUXURY_AMENITIES & amenities) >= 2:
+                    score += 0.1
+            elif comfort_level == "low":
+                # Budget travelers care less about amenities
+                if hotel.price_per_night < 100:
+                    score += 0.15
+
+            # Budget consciousness
+            if budget_threshold and budget_conscious:
+                score += max(0, 0.3 - (hotel.total_price / budget_threshold) * 0.3)
+
+            # Rating boost
+            if hotel.rating:
+                score += (hotel.rating / 5.0) * 0.15
+
+            # Location (closer to center generally preferred)
+            if hotel.distance_to_center_km and hotel.distance_to_center_km < 2:
+                score += 0.1
 
-        # Location (closer to center generally preferred)
-        if hotel.distance_to_center_km and hotel.distance_to_center_km < 2:
-            score += 0.1
+            scored.append((hotel, min(1.0, max(0.0, score))))
 
-        return min(1.0, max(0.0, score))
+        return scored
 
     def _select_diverse_hotels(
         self,
@@ -243,7 +335,8 @@ class TasteProfilerAgent:
         Select diverse set of hotels across different types and price points.
         """
         selected = []
-        types_seen = []
+        selected_ids = set()
+        type_counts = Counter()
         price_buckets = {"low": 0, "mid": 0, "high": 0}
 
         for hotel, score in scored_hotels:
@@ -259,17 +352,19 @@ class TasteProfilerAgent:
                 bucket = "high"
 
             # Ensure diversity
-            if price_buckets[bucket] < 4 and types_seen.count(hotel.type) < 3:
+            if price_buckets[bucket] < 4 and type_counts[hotel.type] < 3:
                 selected.append(hotel)
-                types_seen.append(hotel.type)
+                selected_ids.add(id(hotel))
+                type_counts[hotel.type] += 1
                 price_buckets[bucket] += 1
 
         # Fill remaining slots if needed
         remaining = max_results - len(selected)
         if remaining > 0:
             for hotel, score in scored_hotels:
-                if hotel not in selected:
+                if id(hotel) not in selected_ids:
                     selected.append(hotel)
+                    selected_ids.add(id(hotel))
                     remaining -= 1
                     if remaining == 0:
                         break
@@ -277,8 +372,12 @@ class TasteProfilerAgent:
         return selected
 
 
+# The profiler is stateless, so one shared instance serves every graph
+# invocation without the per-run allocation
+_taste_profiler_singleton = TasteProfilerAgent()
+
+
 # Standalone function for LangGraph node
 def taste_profile_node(state: AgentState) -> AgentState:
     """LangGraph node wrapper for Taste Profiler"""
-    agent = TasteProfilerAgent()
-    return agent.profile(state)
+    return _taste_profiler_singleton.profile(state)
@@ -3,12 +3,17 @@ LangGraph Workflow
 Orchestrates all agents in a sequential pipeline:
 Intent Parser -> Search Orchestrator -> Taste Profiler -> Synthesis Agent
 """
+import asyncio
+import functools
+import hashlib
 import logging
 from typing import Dict, Any
+from langgraph.cache.memory import InMemoryCache
 from langgraph.graph import StateGraph, END
+from langgraph.types import CachePolicy
 from app.models.travel import AgentState
 from app.agents.intent_parser import parse_intent_node
-from app.agents.search_orchestrator import search_node
+from app.agents.search_orchestrator import search_flights_node, search_hotels_node
 from app.agents.taste_profiler import taste_profile_node
 from app.agents.synthesis_agent import synthesis_node
 
@@ -21,11 +26,36 @@ class TravelConciergeWorkflow:
     Uses LangGraph's StateGraph for agent coordination.
     """
 
-    def __init__(self):
-        self.graph = self._build_graph()
-        self.compiled_graph = self.graph.compile()
+    # Node results for identical inputs stay valid for an hour - the LLM
+    # parse of a prompt and the profile ranking of a result set are both
+    # deterministic enough to replay
+    NODE_CACHE_TTL = 3600
+
+    # Explicit runtime config for ainvoke/astream: the pipeline is at most
+    # five supersteps deep so the default recursion limit of 25 just delays
+    # error surfacing on a routing bug, and max_concurrency must cover the
+    # search fan-out branches running side by side
+    GRAPH_CONFIG = {"recursion_limit": 10, "max_concurrency": 4}
 
-    def _build_graph(self) -> StateGraph:
+    def __init__(self):
+        # Graph compilation does node-dependency analysis, so it runs once
+        # per process (cached classmethod) rather than per instance - extra
+        # instantiations, e.g. under uvicorn's reloader, reuse the result
+        self.compiled_graph = self._get_compiled()
+
+    @classmethod
+    @functools.cache
+    def _get_compiled(cls):
+        """Build and compile the graph once per process"""
+        return cls._build_graph().compile(cache=InMemoryCache())
+
+    @classmethod
+    def get_default(cls) -> "TravelConciergeWorkflow":
+        """Shared default instance backed by the process-wide compiled graph"""
+        return workflow
+
+    @classmethod
+    def _build_graph(cls) -> StateGraph:
         """
         Build the LangGraph workflow.
 
@@ -38,32 +68,44 @@ class TravelConciergeWorkflow:
         # Create state graph
         graph = StateGraph(AgentState)
 
-        # Add nodes (agents)
-        graph.add_node("parse_intent", self._wrap_sync_node(parse_intent_node))
-        graph.add_node("search", search_node)
-        graph.add_node("taste_profile", self._wrap_sync_node(taste_profile_node))
+        # Add nodes (agents). Flight and hotel search are independent
+        # network calls, so they run as parallel branches fanning out from
+        # parse_intent and joining at taste_profile
+        graph.add_node(
+            "parse_intent",
+            parse_intent_node,
+            cache_policy=CachePolicy(
+                key_func=cls._intent_cache_key, ttl=cls.NODE_CACHE_TTL
+            ),
+        )
+        graph.add_node("search_flights", search_flights_node)
+        graph.add_node("search_hotels", search_hotels_node)
+        graph.add_node(
+            "taste_profile",
+            cls._taste_profile_update,
+            cache_policy=CachePolicy(
+                key_func=cls._profile_cache_key, ttl=cls.NODE_CACHE_TTL
+            ),
+        )
         graph.add_node("synthesize", synthesis_node)
 
         # Define edges (flow)
         graph.set_entry_point("parse_intent")
 
-        # Conditional routing based on intent parsing success
+        # Conditional routing based on intent parsing success - the router
+        # returns both search branches to fan out, or END
         graph.add_conditional_edges(
             "parse_intent",
-            self._should_continue_after_intent,
-            {
-                "continue": "search",
-                "end": END
-            }
+            cls._should_continue_after_intent,
         )
 
-        # After search, always go to taste profiling
-        graph.add_edge("search", "taste_profile")
+        # Fan-in: taste profiling waits for both search branches
+        graph.add_edge(["search_flights", "search_hotels"], "taste_profile")
 
         # Conditional routing based on search results
         graph.add_conditional_edges(
             "taste_profile",
-            self._should_continue_after_search,
+            cls._should_continue_after_search,
             {
                 "continue": "synthesize",
                 "end": END
@@ -75,44 +117,91 @@ class TravelConciergeWorkflow:
 
         return graph
 
-    def _wrap_sync_node(self, sync_func):
-        """Wrap synchronous node functions to work with async graph"""
-        async def wrapped(state: AgentState) -> AgentState:
-            return sync_func(state)
-        return wrapped
+    @staticmethod
+    def _intent_cache_key(state: AgentState) -> str:
+        """Cache key for parse_intent: the prompt and who asked"""
+        return f"{state.user_id}:{state.user_message}"
 
-    def _should_continue_after_intent(self, state: AgentState) -> str:
+    @staticmethod
+    def _profile_cache_key(state: AgentState) -> str:
+        """
+        Cache key for taste_profile: the parsed intent plus a digest of
+        the search results being ranked.
+        """
+        digest = hashlib.sha256()
+        if state.parsed_intent:
+            digest.update(state.parsed_intent.model_dump_json().encode())
+        for flight in state.flight_options:
+            digest.update(f"f{flight.total_price}".encode())
+        for hotel in state.accommodation_options:
+            digest.update(f"h{hotel.name}{hotel.total_price}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    async def _taste_profile_update(state: AgentState) -> dict:
+        """
+        Run the synchronous taste profiler on a worker thread and return
+        only the fields it ranks. The node is cached on a key derived from
+        intent + search results, with no user identity in it - so a cache
+        hit must never replay identity fields (user_id, user_message,
+        agent_messages) from whichever run populated the entry. A partial
+        update keeps the cached payload strictly taste-scoped.
+        """
+        result = await asyncio.to_thread(taste_profile_node, state)
+        return {
+            "flight_options": result.flight_options,
+            "accommodation_options": result.accommodation_options,
+            "num_flights": result.num_flights,
+            "num_hotels": result.num_hotels,
+            "current_step": result.current_step,
+        }
+
+    @staticmethod
+    def _collect_errors(state: AgentState) -> list:
+        """
+        Client-facing error list: the shared channel plus the per-branch
+        search channels, so a provider outage in a parallel branch still
+        reaches the /api/plan errors array and the SSE stream.
+        """
+        return state.errors + state.flight_search_errors + state.hotel_search_errors
+
+    @staticmethod
+    def _should_continue_after_intent(state: AgentState):
         """
         Conditional edge: Check if intent parsing succeeded.
+        Returns both search branches (fan-out) or END.
         """
         if state.parsed_intent is None:
             logger.warning("Intent parsing failed, ending workflow")
-            return "end"
+            return END
 
         # Check for critical missing fields
         intent = state.parsed_intent
         if not intent.destination and not intent.total_budget:
             state.errors.append("Missing critical information: destination or budget")
-            return "end"
+            return END
 
-        return "continue"
+        return ["search_flights", "search_hotels"]
 
-    def _should_continue_after_search(self, state: AgentState) -> str:
+    @staticmethod
+    def _should_continue_after_search(state: AgentState) -> str:
         """
         Conditional edge: Check if search returned sufficient results.
         """
-        if not state.flight_options and not state.accommodation_options:
+        # The counters are maintained by the search nodes, so the edge
+        # predicate reads two ints instead of materializing list lengths
+        if not state.num_flights and not state.num_hotels:
             logger.warning("No search results found, ending workflow")
             state.errors.append("No travel options found matching your criteria")
             return "end"
 
-        if len(state.flight_options) == 0:
+        if state.num_flights == 0:
             logger.warning("No flights found")
             state.errors.append("No flights available for your dates")
             # Continue anyway if we have hotels
 
-        if len(state.accommodation_options) < 3:
-            logger.warning(f"Limited accommodation options: {len(state.accommodation_options)}")
+        if state.num_hotels < 3:
+            logger.warning("Limited accommodation options: %d", state.num_hotels)
             # Continue anyway
 
         return "continue"
@@ -139,15 +228,17 @@ class TravelConciergeWorkflow:
 
         try:
             # Run the graph
-            logger.info(f"Starting workflow for user: {user_id}")
-            final_state = await self.compiled_graph.ainvoke(initial_state)
+            logger.info("Starting workflow for user: %s", user_id)
+            final_state = await self.compiled_graph.ainvoke(
+                initial_state, config=self.GRAPH_CONFIG
+            )
 
             # Extract results
             result = {
                 "success": len(final_state.itineraries) > 0,
-                "itineraries": [itinerary.model_dump(mode='json') for itinerary in final_state.itineraries],
+                "itineraries": [itinerary.to_json_dict() for itinerary in final_state.itineraries],
                 "agent_messages": final_state.agent_messages,
-                "errors": final_state.errors,
+                "errors": self._collect_errors(final_state),
                 "parsed_intent": final_state.parsed_intent.model_dump(mode='json') if final_state.parsed_intent else None,
                 "metadata": {
                     "num_flight_options": len(final_state.flight_options),
@@ -156,11 +247,11 @@ class TravelConciergeWorkflow:
                 }
             }
 
-            logger.info(f"Workflow completed successfully. Generated {len(final_state.itineraries)} itineraries")
+            logger.info("Workflow completed successfully. Generated %d itineraries", len(final_state.itineraries))
             return result
 
         except Exception as e:
-            logger.error(f"Workflow execution error: {e}", exc_info=True)
+            logger.error("Workflow execution error: %s", e, exc_info=True)
             return {
                 "success": False,
                 "itineraries": [],
@@ -183,69 +274,40 @@ class TravelConciergeWorkflow:
         )
 
         try:
-            final_state_dict = {}
-            # Stream events from the graph
-            async for event in self.compiled_graph.astream(initial_state):
-                # event is a dict with node name as key
-                node_name = list(event.keys())[0]
-                node_state = event[node_name]
-
-                # Store the latest state
-                final_state_dict = node_state
-
-                # LangGraph can return either dict or Pydantic model
-                if isinstance(node_state, dict):
-                    agent_messages = node_state.get("agent_messages", [])
-                    current_step = node_state.get("current_step", "")
-                    errors = node_state.get("errors", [])
-                else:
-                    # It's a Pydantic model
-                    agent_messages = node_state.agent_messages
-                    current_step = node_state.current_step
-                    errors = node_state.errors
-
-                # Yield progress update
+            final_state = initial_state
+            # stream_mode="values" yields the full AgentState after each
+            # superstep, always as the typed model - no dict/model shape
+            # sniffing per event
+            async for state in self.compiled_graph.astream(
+                initial_state, config=self.GRAPH_CONFIG, stream_mode="values"
+            ):
+                final_state = state
+
+                # Yield progress update; last_message is kept in sync by
+                # add_message so this never touches the growing list
                 yield {
                     "type": "agent_update",
-                    "agent": node_name,
-                    "messages": agent_messages[-1] if agent_messages else "",
-                    "current_step": current_step,
-                    "errors": errors
+                    "agent": state.current_step,
+                    "messages": state.last_message,
+                    "current_step": state.current_step,
+                    "errors": self._collect_errors(state)
                 }
 
-            # Final result - handle both dict and Pydantic model
-            if isinstance(final_state_dict, dict):
-                itineraries = final_state_dict.get("itineraries", [])
-                parsed_intent = final_state_dict.get("parsed_intent")
-                flight_options = final_state_dict.get("flight_options", [])
-                accommodation_options = final_state_dict.get("accommodation_options", [])
-            else:
-                itineraries = final_state_dict.itineraries
-                parsed_intent = final_state_dict.parsed_intent
-                flight_options = final_state_dict.flight_options
-                accommodation_options = final_state_dict.accommodation_options
-
-            # Convert Pydantic models to dicts if needed
-            itinerary_dicts = []
-            for itinerary in itineraries:
-                if hasattr(itinerary, 'model_dump'):
-                    itinerary_dicts.append(itinerary.model_dump(mode='json'))
-                elif isinstance(itinerary, dict):
-                    itinerary_dicts.append(itinerary)
-
             yield {
                 "type": "complete",
-                "success": len(itineraries) > 0,
-                "itineraries": itinerary_dicts,
-                "parsed_intent": parsed_intent.model_dump(mode='json') if parsed_intent and hasattr(parsed_intent, 'model_dump') else parsed_intent,
+                "success": len(final_state.itineraries) > 0,
+                "itineraries": [
+                    itinerary.to_json_dict() for itinerary in final_state.itineraries
+                ],
+                "parsed_intent": final_state.parsed_intent.model_dump(mode='json') if final_state.parsed_intent else None,
                 "metadata": {
-                    "num_flight_options": len(flight_options),
-                    "num_hotel_options": len(accommodation_options),
+                    "num_flight_options": final_state.num_flights,
+                    "num_hotel_options": final_state.num_hotels,
                 }
             }
 
         except Exception as e:
-            logger.error(f"Streaming workflow error: {e}", exc_info=True)
+            logger.error("Streaming workflow error: %s", e, exc_info=True)
             yield {
                 "type": "error",
                 "error": str(e)
@@ -2,15 +2,18 @@
 FastAPI Application
 Main entry point for the Voyana API.
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
-import json
+import orjson
 
+from app.agents.search_orchestrator import close_search_orchestrator_agent
 from app.agents.workflow import workflow
 from app.utils.config import settings
 from app.utils.auth import verify_google_token, create_access_token, verify_token
@@ -28,6 +31,8 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
     logger.info("Starting Voyana API")
     yield
+    # Drain the shared outbound HTTP connection pools before exit
+    await close_search_orchestrator_agent()
     logger.info("Shutting down Voyana API")
 
 
@@ -36,7 +41,43 @@ app = FastAPI(
     title="Voyana API",
     description="Multi-agent AI system for personalized travel planning",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson handles the large itinerary payloads (datetimes included)
+    # far faster than the stdlib encoder
+    default_response_class=ORJSONResponse
+)
+
+class RouteAwareGZipMiddleware:
+    """
+    GZipMiddleware that passes excluded paths through uncompressed.
+    Starlette's gzip streaming path doesn't flush the compressor per
+    chunk, so small SSE events would sit in the zlib buffer and the
+    client would see a stalled, bursty stream - the event stream must
+    bypass compression (the reverse proxy can compress it if desired).
+    """
+
+    def __init__(self, app, exclude_paths=(), **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+# Itinerary payloads are 50-200 KB of text-heavy JSON, so gzip cuts the
+# wire size several-fold for a modest CPU cost at level 5. Responses under
+# 1 KB (health checks, auth) are passed through untouched, and the SSE
+# endpoint is excluded entirely so events reach the client as they are
+# produced.
+app.add_middleware(
+    RouteAwareGZipMiddleware,
+    exclude_paths=("/api/plan/stream",),
+    minimum_size=1024,
+    compresslevel=5,
 )
 
 # CORS middleware
@@ -162,13 +203,13 @@ async def google_auth(request: GoogleAuthRequest):
         if settings.allowed_emails:
             user_email = user_info['email'].lower()
             if user_email not in settings.allowed_emails:
-                logger.warning(f"Access denied for non-whitelisted email: {user_email}")
+                logger.warning("Access denied for non-whitelisted email: %s", user_email)
                 raise HTTPException(
                     status_code=403,
                     detail="Access denied. Your email is not authorized to use this application."
                 )
 
-        logger.info(f"User authenticated: {user_info['email']}")
+        logger.info("User authenticated: %s", user_info['email'])
 
         # Create JWT token
         access_token = create_access_token(
@@ -191,7 +232,7 @@ async def google_auth(request: GoogleAuthRequest):
         )
 
     except Exception as e:
-        logger.error(f"Authentication error: {e}", exc_info=True)
+        logger.error("Authentication error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -208,15 +249,16 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     }
 
 
-@app.post("/api/plan", response_model=TravelResponse)
+@app.post("/api/plan")
 async def plan_trip(request: TravelRequest):
     """
     Main endpoint for travel planning.
     Processes natural language request and returns 3 complete itineraries.
+    Response shape matches TravelResponse.
     """
     try:
-        logger.info(f"Received travel request from user: {request.user_id}")
-        logger.info(f"Message: {request.message}")
+        logger.info("Received travel request from user: %s", request.user_id)
+        logger.info("Message: %s", request.message)
 
         # Run workflow
         result = await workflow.run(
@@ -224,10 +266,13 @@ async def plan_trip(request: TravelRequest):
             user_id=request.user_id
         )
 
-        return TravelResponse(**result)
+        # The workflow already returns JSON-ready dicts; building a
+        # TravelResponse here would re-validate and re-serialize all three
+        # itineraries for no gain
+        return ORJSONResponse(content=result)
 
     except Exception as e:
-        logger.error(f"Travel planning error: {e}", exc_info=True)
+        logger.error("Travel planning error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -238,20 +283,39 @@ async def plan_trip_stream(request: TravelRequest):
     Returns Server-Sent Events with real-time agent updates.
     """
     async def event_generator():
-        """Generate SSE events"""
+        """
+        Generate SSE events as pre-framed bytes.
+        A producer task drains the workflow stream and encodes each event
+        once, through a bounded queue, so the graph never blocks on a slow
+        client's HTTP send buffer.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=32)
+
+        async def produce():
+            try:
+                async for update in workflow.run_with_streaming(
+                    user_message=request.message,
+                    user_id=request.user_id
+                ):
+                    # Format as SSE, framing applied once at encode time
+                    await queue.put(b"data: " + orjson.dumps(update, default=str) + b"\n\n")
+
+            except Exception as e:
+                logger.error("Streaming error: %s", e, exc_info=True)
+                error_event = orjson.dumps({"type": "error", "error": str(e)})
+                await queue.put(b"data: " + error_event + b"\n\n")
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
         try:
-            async for update in workflow.run_with_streaming(
-                user_message=request.message,
-                user_id=request.user_id
-            ):
-                # Format as SSE
-                event_data = json.dumps(update)
-                yield f"data: {event_data}\n\n"
-
-        except Exception as e:
-            logger.error(f"Streaming error: {e}", exc_info=True)
-            error_event = json.dumps({"type": "error", "error": str(e)})
-            yield f"data: {error_event}\n\n"
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            producer.cancel()
 
     return StreamingResponse(
         event_generator(),
@@ -263,13 +327,10 @@ async def plan_trip_stream(request: TravelRequest):
     )
 
 
-@app.get("/api/destinations")
-async def get_popular_destinations():
-    """
-    Get list of popular destinations.
-    Useful for autocomplete in frontend.
-    """
-    destinations = [
+# The destinations list is static, so serialize it once at import and
+# serve the cached bytes - autocomplete can hit this on every keystroke
+_DESTINATIONS_BYTES = orjson.dumps({
+    "destinations": [
         {"name": "Paris", "country": "France", "code": "PAR"},
         {"name": "Rome", "country": "Italy", "code": "ROM"},
         {"name": "Barcelona", "country": "Spain", "code": "BCN"},
@@ -281,16 +342,35 @@ async def get_popular_destinations():
         {"name": "Bali", "country": "Indonesia", "code": "DPS"},
         {"name": "Lisbon", "country": "Portugal", "code": "LIS"},
     ]
-    return {"destinations": destinations}
+})
+
+
+@app.get("/api/destinations")
+async def get_popular_destinations():
+    """
+    Get list of popular destinations.
+    Useful for autocomplete in frontend.
+    """
+    return Response(
+        content=_DESTINATIONS_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
 
 
 # For development
 if __name__ == "__main__":
     import uvicorn
+    # uvloop + httptools (bundled with uvicorn[standard]) replace the
+    # selector event loop and pure-Python HTTP parser - the workflow is
+    # many small awaits over LLM and search APIs, which is exactly the
+    # load uvloop speeds up
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
@@ -3,9 +3,10 @@ Pydantic models for travel data structures.
 These models define the shape of data flowing through the agent system.
 """
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from functools import cached_property
+from typing import ClassVar, List, Optional, Dict, Any, FrozenSet
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 
 class TravelerType(str, Enum):
@@ -27,6 +28,10 @@ class TravelStyle(str, Enum):
 
 class Traveler(BaseModel):
     """Individual traveler information"""
+    # Leaf value object - frozen so instances are immutable and hashable,
+    # and validation skips the mutable-field bookkeeping
+    model_config = ConfigDict(frozen=True)
+
     type: TravelerType
     age: Optional[int] = None
     name: Optional[str] = None
@@ -47,8 +52,8 @@ class TravelIntent(BaseModel):
     duration_days: Optional[int] = Field(None, description="Trip duration in days")
     date_flexibility: int = Field(3, description="Days of flexibility (+/-)")
 
-    # Travelers
-    travelers: List[Traveler] = Field(default_factory=list)
+    # Travelers - stored as plain counts; the object list is derived on
+    # demand below instead of being allocated and validated per intent
     num_adults: int = Field(1, ge=1)
     num_children: int = Field(0, ge=0)
     num_infants: int = Field(0, ge=0)
@@ -70,24 +75,43 @@ class TravelIntent(BaseModel):
     mobility_requirements: Optional[str] = None
     dietary_restrictions: List[str] = Field(default_factory=list)
 
-    @validator('duration_days', always=True)
-    def calculate_duration(cls, v, values):
+    @cached_property
+    def travelers(self) -> List[Traveler]:
+        """Traveler objects synthesized from the counts, built only if asked"""
+        return (
+            [Traveler(type=TravelerType.ADULT)] * self.num_adults
+            + [Traveler(type=TravelerType.CHILD)] * self.num_children
+            + [Traveler(type=TravelerType.INFANT)] * self.num_infants
+        )
+
+    # This runs once, at the LLM-output validation boundary. Graph state
+    # copies never re-validate existing instances (pydantic v2 default),
+    # and trusted rebuilds go through model_construct, so keeping this as
+    # a stored field is cheaper than a computed_field re-deriving it on
+    # every serialization.
+    @model_validator(mode='after')
+    def calculate_duration(self):
         """Automatically calculate duration_days from dates if not provided"""
-        if v is not None:
-            return v  # Use provided value if present
-
-        departure = values.get('departure_date')
-        return_date = values.get('return_date')
+        if self.duration_days is None and self.departure_date and self.return_date:
+            duration = (self.return_date - self.departure_date).days
+            self.duration_days = duration if duration > 0 else 1  # At least 1 day
+        return self
 
-        if departure and return_date:
-            duration = (return_date - departure).days
-            return duration if duration > 0 else 1  # At least 1 day
 
-        return None
+# Generating the TravelIntent JSON schema walks every nested enum and list
+# default, so do it once at import - the structured-output binding in the
+# intent parser (and anything else needing the raw schema) reads this
+# instead of re-deriving it on the first request
+TRAVEL_INTENT_JSON_SCHEMA = TravelIntent.model_json_schema()
 
 
 class FlightSegment(BaseModel):
     """Single flight segment"""
+    # Segments are never mutated after search returns them; freezing keeps
+    # the thousands of instances per request safely shareable across the
+    # scoring and synthesis passes
+    model_config = ConfigDict(frozen=True)
+
     origin: str
     destination: str
     departure: datetime
@@ -113,6 +137,13 @@ class FlightOption(BaseModel):
     source: str = Field(default="amadeus")
     last_updated: datetime = Field(default_factory=datetime.now)
 
+    @cached_property
+    def carriers_set(self) -> FrozenSet[str]:
+        """All carriers across outbound and return segments, computed once"""
+        return frozenset(
+            seg.carrier for seg in (*self.outbound_segments, *self.return_segments)
+        )
+
 
 class AccommodationOption(BaseModel):
     """Hotel or accommodation option"""
@@ -148,6 +179,10 @@ class AccommodationOption(BaseModel):
 
 class Activity(BaseModel):
     """Activity or experience option"""
+    # Activities are cached and reused across daily plans (see
+    # synthesis_agent._sample_activity), so they must stay immutable
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     category: str  # museum, tour, food, adventure, etc.
@@ -206,17 +241,28 @@ class Itinerary(BaseModel):
     # Taste alignment score (from Taste Profiler Agent)
     taste_score: Optional[float] = Field(None, ge=0, le=1)
 
-    @validator("total_cost", always=True)
-    def calculate_total(cls, v, values):
+    # Memoized JSON form - the recursive dump over flights, hotels and
+    # daily plans is expensive, and the same itinerary gets serialized by
+    # the workflow result, the streaming final event, and the API response
+    _cached_json: Optional[dict] = PrivateAttr(None)
+
+    def to_json_dict(self) -> dict:
+        """JSON-ready dict of this itinerary, dumped once and reused"""
+        if self._cached_json is None:
+            self._cached_json = self.model_dump(mode='json')
+        return self._cached_json
+
+    @model_validator(mode='after')
+    def calculate_total(self):
         """Auto-calculate total cost"""
-        if v == 0 or v is None:
-            return (
-                values.get("flight_cost", 0)
-                + values.get("accommodation_cost", 0)
-                + values.get("activities_cost", 0)
-                + values.get("estimated_food_cost", 0)
+        if not self.total_cost:
+            self.total_cost = (
+                self.flight_cost
+                + self.accommodation_cost
+                + self.activities_cost
+                + self.estimated_food_cost
             )
-        return v
+        return self
 
 
 class AgentState(BaseModel):
@@ -244,10 +290,41 @@ class AgentState(BaseModel):
     # Final output
     itineraries: List[Itinerary] = Field(default_factory=list)
 
+    # Lightweight counters kept in sync by the producer nodes so edge
+    # predicates and progress events read O(1) fields instead of lists
+    num_flights: int = 0
+    num_hotels: int = 0
+    last_message: str = ""
+
     # Agent communication
     agent_messages: List[str] = Field(default_factory=list)
     current_step: str = "start"
     errors: List[str] = Field(default_factory=list)
 
-    class Config:
-        arbitrary_types_allowed = True
+    # Branch-scoped error channels for the parallel search fan-out: each
+    # branch node owns its key so the graph can merge them without a
+    # reducer, and the workflow folds them into the client-facing errors
+    # when it assembles output
+    flight_search_errors: List[str] = Field(default_factory=list)
+    hotel_search_errors: List[str] = Field(default_factory=list)
+
+    # Rolling-window cap for agent_messages: state is copied between graph
+    # nodes, so an unbounded log would make every merge O(total messages)
+    MAX_AGENT_MESSAGES: ClassVar[int] = 256
+
+    def add_message(self, message: str) -> None:
+        """Append an agent progress message, keeping last_message in sync.
+
+        The log is kept to a rolling window of MAX_AGENT_MESSAGES so
+        long-running conversations don't grow the state payload without
+        bound.
+        """
+        messages = self.agent_messages
+        messages.append(message)
+        if len(messages) > self.MAX_AGENT_MESSAGES:
+            del messages[:-self.MAX_AGENT_MESSAGES]
+        self.last_message = message
+
+    # defer_build postpones schema compilation to first use, and state is
+    # mutated field-by-field between nodes so assignment validation stays off
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
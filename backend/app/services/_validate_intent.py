@@ -0,0 +1,21 @@
+"""
+Shared flight-search precondition checks.
+
+Both flight providers need the same slots filled before a search is
+worth attempting; validating once up front lets a partially-filled
+intent - common mid-conversation, before all slots are parsed - bail
+out in microseconds instead of falling through each provider's own
+checks and airport-code lookups.
+"""
+from typing import Optional
+
+from app.models.travel import TravelIntent
+
+
+def validate_flight_intent(intent: TravelIntent) -> Optional[str]:
+    """Return a reason string if the intent can't be searched, else None"""
+    if not intent.origin or not intent.destination:
+        return "Missing origin or destination for flight search"
+    if not intent.departure_date or not intent.return_date:
+        return "Missing dates for flight search"
+    return None
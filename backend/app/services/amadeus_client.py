@@ -2,15 +2,309 @@
 Amadeus API Client for flight searches.
 Documentation: https://developers.amadeus.com/
 """
+import asyncio
+import functools
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from types import MappingProxyType
 from datetime import date, datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from amadeus import Client, ResponseError
 from app.models.travel import FlightOption, FlightSegment, TravelIntent
+from app.services._validate_intent import validate_flight_intent
 from app.utils.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Worker pool for fanning out alternative-airport probes. The Amadeus SDK
+# is synchronous, so concurrency here comes from threads - the calls are
+# pure network waits, and eight covers the worst-case fallback fan-out
+_ROUTE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="amadeus-route")
+
+# Separate pool for offloading whole search_flights calls from the event
+# loop. Kept distinct from _ROUTE_POOL because a search blocks on its own
+# route probes - sharing one pool could deadlock with every worker stuck
+# waiting for a probe that has no worker left to run on
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="amadeus-search")
+
+# ISO 8601 duration like PT2H30M, compiled once - _parse_duration runs
+# twice per offer, so per-call regex cache lookups add up during parsing
+_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?')
+
+def _enable_orjson_decoding() -> None:
+    """
+    Best-effort: point the SDK's response parsing at orjson.loads, which
+    decodes the wide flight-offers payloads 2-3x faster than stdlib json.
+    orjson.loads is a drop-in for json.loads on bytes/str input; if the
+    installed SDK lays its parser out differently, leave it untouched.
+    """
+    try:
+        import orjson
+        from amadeus.client import response as amadeus_response
+        if hasattr(amadeus_response, 'json'):
+            amadeus_response.json = type(
+                'OrjsonShim', (), {'loads': staticmethod(orjson.loads)}
+            )
+            logger.info("Amadeus SDK responses decoded with orjson")
+    except Exception as e:
+        logger.debug("orjson decoding unavailable for Amadeus SDK: %s", e)
+
+
+_enable_orjson_decoding()
+
+
+def _enable_session_pooling(client: Client) -> None:
+    """
+    Best-effort: mount a keep-alive pooled requests.Session on the SDK's
+    HTTP layer so repeated calls reuse TCP/TLS connections instead of
+    paying a fresh handshake (~100-250ms) each time.
+
+    Only SDK builds that route through a requests session expose the hook;
+    current amadeus releases go through urllib per call, in which case this
+    is a no-op and the route cache/token bucket carry the savings instead.
+    """
+    try:
+        http_client = getattr(client, 'http_client', None) or client
+        if getattr(http_client, '_session', None) is None:
+            return
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount(
+            'https://',
+            HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+        )
+        http_client._session = session
+        logger.info("Amadeus SDK session pooling enabled")
+    except Exception as e:
+        logger.debug("Session pooling unavailable for Amadeus SDK: %s", e)
+
+
+def _normalize_city(location: str) -> str:
+    """
+    Canonical lookup key for the city tables: keeps only the part before
+    any comma (partition avoids split's list allocation and stops at the
+    first comma), trimmed and casefolded to match the pre-normalized keys.
+    """
+    return location.partition(',')[0].strip().casefold()
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket pacing outbound Amadeus calls.
+    The parallel fallback fan-out can otherwise burst eight requests in
+    one instant and trip the provider's quota; acquire() blocks just long
+    enough to keep the burst within the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updated) * self._rate,
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+# 10 requests/second with a burst of 20 sits comfortably under the
+# Amadeus test-tier limits while letting the parallel probes overlap
+_RATE_LIMITER = _TokenBucket(rate=10.0, burst=20)
+
+# Retry policy for 429/503: bounded exponential backoff with jitter
+_MAX_RETRIES = 3
+_BACKOFF_BASE = 0.5
+
+# Head start the primary route gets before alternatives are prefetched
+# behind it - long enough that a cache hit or fast upstream answers alone,
+# short enough that a slow search overlaps with the fallback probes
+_ALT_PREFETCH_DELAY = 0.2
+
+# Route-level result cache: identical (route, dates, travelers) queries
+# repeat across the fallback fan-out and across users searching popular
+# routes, and each one is a ~500ms network call plus Amadeus quota. Fares
+# stay fresh enough for 10 minutes; empty results get a much shorter TTL
+# so a transiently dry route is retried soon.
+_ROUTE_CACHE_MAXSIZE = 4096
+_ROUTE_CACHE_TTL = 600.0
+_ROUTE_CACHE_EMPTY_TTL = 60.0
+_route_cache: dict = {}
+_route_cache_lock = threading.Lock()
+
+# City-name lookup tables, built once at import instead of as dict
+# literals inside the lookup methods, and wrapped in MappingProxyType so
+# the immutability is explicit. Keys are pre-lowercased.
+_IATA_CODES = MappingProxyType({
+    # Major European Cities
+    "london": "LON",
+    "paris": "PAR",
+    "rome": "ROM",
+    "barcelona": "BCN",
+    "madrid": "MAD",
+    "berlin": "BER",
+    "amsterdam": "AMS",
+    "lisbon": "LIS",
+    "copenhagen": "CPH",
+    "stockholm": "STO",
+    "oslo": "OSL",
+    "helsinki": "HEL",
+    "vienna": "VIE",
+    "prague": "PRG",
+    "budapest": "BUD",
+    "warsaw": "WAW",
+    "dublin": "DUB",
+    "athens": "ATH",
+    "istanbul": "IST",
+
+    # Beach Destinations
+    "nice": "NCE",
+    "cannes": "NCE",  # Uses Nice airport
+    "valencia": "VLC",
+    "malaga": "AGP",
+    "alicante": "ALC",
+    "palma": "PMI",
+    "ibiza": "IBZ",
+    "mykonos": "JMK",
+    "santorini": "JTR",
+    "split": "SPU",
+    "dubrovnik": "DBV",
+    "faro": "FAO",
+    "porto": "OPO",
+
+    # Additional European
+    "milan": "MIL",
+    "venice": "VCE",
+    "florence": "FLR",
+    "naples": "NAP",
+    "zurich": "ZRH",
+    "geneva": "GVA",
+    "brussels": "BRU",
+    "lyon": "LYS",
+    "marseille": "MRS",
+    "edinburgh": "EDI",
+    "manchester": "MAN",
+    "munich": "MUC",
+    "frankfurt": "FRA",
+    "hamburg": "HAM",
+
+    # International
+    "new york": "NYC",
+    "los angeles": "LAX",
+    "san francisco": "SFO",
+    "chicago": "CHI",
+    "miami": "MIA",
+    "orlando": "MCO",
+    "las vegas": "LAS",
+
+    # Japan
+    "tokyo": "TYO",
+    "kyoto": "KIX",  # Uses Osaka Kansai International Airport
+    "osaka": "KIX",  # Kansai International Airport
+    "yokohama": "TYO",  # Uses Tokyo airports
+    "nagoya": "NGO",
+    "sapporo": "SPK",
+    "fukuoka": "FUK",
+    "nara": "KIX",  # Uses Osaka Kansai (close to Kyoto)
+    "nagano": "TYO",  # Route through Tokyo (no international flights to Nagano)
+
+    # Other Asia-Pacific
+    "dubai": "DXB",
+    "singapore": "SIN",
+    "hong kong": "HKG",
+    "bangkok": "BKK",
+    "bali": "DPS",
+    "phuket": "HKT",
+    "seoul": "SEL",
+    "beijing": "BJS",
+    "shanghai": "SHA",
+    "delhi": "DEL",
+    "mumbai": "BOM",
+    "sydney": "SYD",
+    "melbourne": "MEL",
+
+    # Americas
+    "cancun": "CUN",
+    "mexico city": "MEX",
+    "rio de janeiro": "RIO",
+    "sao paulo": "SAO",
+    "buenos aires": "BUE",
+    "toronto": "YTO",
+    "vancouver": "YVR",
+    "montreal": "YMQ",
+
+    # Canary Islands
+    "tenerife": "TCI",
+    "gran canaria": "LPA",
+    "lanzarote": "ACE",
+
+    # Small cities without international airports (route through hubs)
+    "takayama": "TYO",  # Japan - route through Tokyo
+    "hakone": "TYO",  # Japan - route through Tokyo
+    "nikko": "TYO",  # Japan - route through Tokyo
+    "kanazawa": "TYO",  # Japan - route through Tokyo
+    "kobe": "KIX",  # Japan - route through Osaka
+    "siena": "ROM",  # Italy - route through Rome or Florence
+    "assisi": "ROM",  # Italy - route through Rome
+    "verona": "MIL",  # Italy - route through Milan
+    "bologna": "MIL",  # Italy - route through Milan
+    "cinque terre": "MIL",  # Italy - route through Milan
+    "positano": "NAP",  # Italy - route through Naples
+    "granada": "MAD",  # Spain - route through Madrid
+    "san sebastian": "MAD",  # Spain - route through Madrid
+    "seville": "MAD",  # Spain - route through Madrid
+    "tours": "PAR",  # France - route through Paris
+    "avignon": "PAR",  # France - route through Paris
+    "annecy": "PAR",  # France - route through Paris
+    "salzburg": "VIE",  # Austria - route through Vienna
+    "innsbruck": "VIE",  # Austria - route through Vienna
+})
+
+# Map cities to alternative airports
+_ALT_AIRPORTS = MappingProxyType({
+    # Japan - multiple airport options
+    "kyoto": ["OSA", "ITM", "UKB"],  # Osaka region: Kansai, Itami, Kobe
+    "osaka": ["ITM", "UKB"],  # Also try Itami and Kobe besides Kansai
+    "tokyo": ["NRT", "HND"],  # Narita and Haneda
+
+    # Europe - cities with multiple airports
+    "london": ["LHR", "LGW", "STN", "LTN"],  # Heathrow, Gatwick, Stansted, Luton
+    "paris": ["CDG", "ORY"],  # Charles de Gaulle, Orly
+    "rome": ["FCO", "CIA"],  # Fiumicino, Ciampino
+    "milan": ["MXP", "LIN", "BGY"],  # Malpensa, Linate, Bergamo
+    "barcelona": ["BCN", "GRO"],  # El Prat, Girona
+
+    # North America
+    "new york": ["JFK", "EWR", "LGA"],  # JFK, Newark, LaGuardia
+    "los angeles": ["LAX", "BUR", "ONT"],
+    "chicago": ["ORD", "MDW"],
+    "san francisco": ["SFO", "OAK", "SJC"],
+
+    # Asia
+    "bangkok": ["BKK", "DMK"],  # Suvarnabhumi, Don Mueang
+    "seoul": ["ICN", "GMP"],  # Incheon, Gimpo
+    "shanghai": ["PVG", "SHA"],  # Pudong, Hongqiao
+    "beijing": ["PEK", "PKX"],  # Capital, Daxing
+})
+
 
 class AmadeusFlightService:
     """
@@ -23,6 +317,10 @@ class AmadeusFlightService:
             client_id=settings.amadeus_api_key,
             client_secret=settings.amadeus_api_secret
         )
+        _enable_session_pooling(self.client)
+        # Per-city memo for dynamically discovered airports - one
+        # reference-data call per city for the lifetime of the service
+        self._airport_discovery_cache: dict = {}
 
     def search_flights(
         self,
@@ -34,12 +332,8 @@ class AmadeusFlightService:
         Tries multiple airports if first attempt returns no results.
         Returns list of FlightOption objects.
         """
-        if not intent.origin or not intent.destination:
-            logger.warning("Missing origin or destination for flight search")
-            return []
-
-        if not intent.departure_date or not intent.return_date:
-            logger.warning(f"Missing dates for flight search - departure: {intent.departure_date}, return: {intent.return_date}")
+        if (invalid_reason := validate_flight_intent(intent)) is not None:
+            logger.warning("%s - intent not searchable yet", invalid_reason)
             return []
 
         # Get primary IATA codes
@@ -50,54 +344,136 @@ class AmadeusFlightService:
         origin_alternatives = self._get_alternative_airports(intent.origin, origin_code)
         dest_alternatives = self._get_alternative_airports(intent.destination, dest_code)
 
-        logger.info(f"Searching flights: {intent.origin} ({origin_code}) -> {intent.destination} ({dest_code})")
-        logger.info(f"Alternative origins: {origin_alternatives}")
-        logger.info(f"Alternative destinations: {dest_alternatives}")
-        logger.info(f"Dates: {intent.departure_date.isoformat()} to {intent.return_date.isoformat()}")
-        logger.info(f"Travelers: {intent.num_adults} adults, {intent.num_children} children")
-
-        # Try primary route first
-        flight_options = self._search_route(
-            origin_code, dest_code, intent, max_results
+        logger.info("Searching flights: %s (%s) -> %s (%s)", intent.origin, origin_code, intent.destination, dest_code)
+        logger.info("Alternative origins: %s", origin_alternatives)
+        logger.info("Alternative destinations: %s", dest_alternatives)
+        logger.info("Dates: %s to %s", intent.departure_date, intent.return_date)
+        logger.info("Travelers: %d adults, %d children", intent.num_adults, intent.num_children)
+
+        # Try primary route first - the common case, and a fast answer here
+        # avoids burning quota on the alternatives at all. The primary gets
+        # a short head start; if it's still on the wire after the stagger
+        # (slow upstream, cold cache) the alternatives are prefetched behind
+        # it rather than waiting for it to come back empty first.
+        primary_future = _ROUTE_POOL.submit(
+            self._search_route, origin_code, dest_code, intent, max_results
         )
+        primary_options: Optional[List[FlightOption]] = None
+        try:
+            primary_options = primary_future.result(timeout=_ALT_PREFETCH_DELAY)
+        except TimeoutError:
+            logger.info(
+                "Primary route %s -> %s still in flight after %.1fs, prefetching alternatives",
+                origin_code, dest_code, _ALT_PREFETCH_DELAY
+            )
+        except Exception as e:
+            logger.error("Primary route %s -> %s failed: %s", origin_code, dest_code, e)
+            primary_options = []
+
+        if primary_options:
+            logger.info("✅ Found %d flights on primary route %s -> %s", len(primary_options), origin_code, dest_code)
+            return primary_options
+
+        # Fallback: probe every alternative route concurrently instead of
+        # up to eight sequential round-trips. Pairs are listed in priority
+        # order (dest alts, then origin alts, then bounded combos) and the
+        # first non-empty result in that order wins, so the outcome matches
+        # the old sequential escalation at roughly the cost of one request.
+        # Combos are ranked before the quota cap is applied: the alternative
+        # lists are already ordered best-first, so the rank sum of the two
+        # sides approximates success likelihood - a capped cartesian slice
+        # would instead spend quota on arbitrary low-likelihood pairs
+        ranked_combos = sorted(
+            (
+                (origin_rank + dest_rank, alt_origin, alt_dest)
+                for origin_rank, alt_origin in enumerate(origin_alternatives)
+                for dest_rank, alt_dest in enumerate(dest_alternatives)
+            )
+        )[:settings.flight_combo_probes]
 
-        if flight_options:
-            logger.info(f"✅ Found {len(flight_options)} flights on primary route {origin_code} -> {dest_code}")
-            return flight_options
+        candidate_pairs: List[Tuple[str, str]] = (
+            [(origin_code, alt_dest) for alt_dest in dest_alternatives]
+            + [(alt_origin, dest_code) for alt_origin in origin_alternatives]
+            + [(alt_origin, alt_dest) for _, alt_origin, alt_dest in ranked_combos]
+        )
 
-        # Try alternative destination airports
-        for alt_dest in dest_alternatives:
-            logger.info(f"Trying alternative destination: {origin_code} -> {alt_dest}")
-            flight_options = self._search_route(
-                origin_code, alt_dest, intent, max_results
-            )
-            if flight_options:
-                logger.info(f"✅ Found {len(flight_options)} flights using alternative destination {alt_dest}")
+        # If the primary is still pending it stays in the race at top
+        # priority - its in-flight request is reused rather than resubmitted,
+        # and a late non-empty primary result still beats every alternative
+        future_priority = {}
+        if primary_options is None:
+            candidate_pairs = [(origin_code, dest_code)] + candidate_pairs
+            future_priority[primary_future] = 0
+            offset = 1
+        else:
+            offset = 0
+
+        if candidate_pairs:
+            logger.info("Probing %d alternative routes in parallel", len(candidate_pairs) - offset)
+            for i, (o, d) in enumerate(candidate_pairs[offset:]):
+                future_priority[
+                    _ROUTE_POOL.submit(self._search_route, o, d, intent, max_results)
+                ] = i + offset
+            pending = set(future_priority)
+            results: dict = {}
+            next_priority = 0
+            winner = None
+            # Resolve probes as they complete: the moment the best-ranked
+            # still-unresolved route has results, stop waiting and cancel
+            # whatever hasn't started yet - no point spending quota on
+            # lower-priority routes we would discard anyway
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = future_priority[future]
+                    try:
+                        results[idx] = future.result()
+                    except Exception as e:
+                        alt_origin, alt_dest = candidate_pairs[idx]
+                        logger.error("Route probe %s -> %s failed: %s", alt_origin, alt_dest, e)
+                        results[idx] = []
+                while next_priority in results:
+                    if results[next_priority]:
+                        winner = next_priority
+                        break
+                    next_priority += 1
+            for future in pending:
+                future.cancel()
+            if winner is not None:
+                alt_origin, alt_dest = candidate_pairs[winner]
+                flight_options = results[winner]
+                logger.info("✅ Found %d flights on %s -> %s", len(flight_options), alt_origin, alt_dest)
                 return flight_options
 
-        # Try alternative origin airports
-        for alt_origin in origin_alternatives:
-            logger.info(f"Trying alternative origin: {alt_origin} -> {dest_code}")
-            flight_options = self._search_route(
-                alt_origin, dest_code, intent, max_results
-            )
-            if flight_options:
-                logger.info(f"✅ Found {len(flight_options)} flights using alternative origin {alt_origin}")
-                return flight_options
+        logger.error("❌ No flights found after trying all airport combinations")
+        return []
 
-        # Try combinations of alternative airports
-        for alt_origin in origin_alternatives[:2]:  # Limit to avoid too many requests
-            for alt_dest in dest_alternatives[:2]:
-                logger.info(f"Trying alternative combo: {alt_origin} -> {alt_dest}")
-                flight_options = self._search_route(
-                    alt_origin, alt_dest, intent, max_results
-                )
-                if flight_options:
-                    logger.info(f"✅ Found {len(flight_options)} flights on {alt_origin} -> {alt_dest}")
-                    return flight_options
+    async def search_flights_async(
+        self,
+        intent: TravelIntent,
+        max_results: int = 10
+    ) -> List[FlightOption]:
+        """
+        Async wrapper over search_flights for event-loop callers.
+        The synchronous SDK runs on the service's persistent thread pool,
+        so the loop never blocks for the network round-trip and the pool
+        (together with the token bucket) provides the backpressure.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            _SEARCH_POOL,
+            functools.partial(self.search_flights, intent, max_results)
+        )
 
-        logger.error(f"❌ No flights found after trying all airport combinations")
-        return []
+    async def get_airport_suggestions_async(
+        self,
+        query: str,
+        max_results: int = 5
+    ) -> List[dict]:
+        """Async wrapper over get_airport_suggestions, same offload path"""
+        return await asyncio.get_running_loop().run_in_executor(
+            _SEARCH_POOL,
+            functools.partial(self.get_airport_suggestions, query, max_results)
+        )
 
     def _search_route(
         self,
@@ -108,87 +484,156 @@ class AmadeusFlightService:
     ) -> List[FlightOption]:
         """
         Search for flights on a specific route.
-        Returns empty list if no flights found.
+        Results are cached briefly per (route, dates, travelers) so the
+        fallback fan-out and concurrent users don't re-issue identical
+        queries. Returns empty list if no flights found.
         """
-        try:
-            # Build search parameters
-            search_params = {
-                'originLocationCode': origin_code,
-                'destinationLocationCode': dest_code,
-                'departureDate': intent.departure_date.isoformat(),
-                'returnDate': intent.return_date.isoformat(),
-                'adults': intent.num_adults,
-                'max': max_results,
-                'currencyCode': 'EUR'
-            }
-
-            # Only include children parameter if there are children
-            if intent.num_children > 0:
-                search_params['children'] = intent.num_children
-
-            # Search for round-trip flights
-            response = self.client.shopping.flight_offers_search.get(**search_params)
-
-            # Parse response into FlightOption objects
-            flight_options = []
-            for offer in response.data:
-                try:
-                    flight_option = self._parse_flight_offer(offer)
-                    flight_options.append(flight_option)
-                except Exception as e:
-                    logger.error(f"Error parsing flight offer: {e}")
-                    continue
+        cache_key = (
+            origin_code,
+            dest_code,
+            intent.departure_date,
+            intent.return_date,
+            intent.num_adults,
+            intent.num_children,
+            max_results,
+        )
+        now = time.monotonic()
+        with _route_cache_lock:
+            cached = _route_cache.get(cache_key)
+            if cached and cached[0] > now:
+                # Refresh recency and hand back a copy so callers can
+                # sort/merge without mutating the cached list
+                del _route_cache[cache_key]
+                _route_cache[cache_key] = cached
+                logger.info("Route cache hit: %s -> %s", origin_code, dest_code)
+                return list(cached[1])
+
+        flight_options = self._search_route_uncached(
+            origin_code, dest_code, intent, max_results
+        )
 
-            return flight_options
+        ttl = _ROUTE_CACHE_TTL if flight_options else _ROUTE_CACHE_EMPTY_TTL
+        with _route_cache_lock:
+            if len(_route_cache) >= _ROUTE_CACHE_MAXSIZE:
+                _route_cache.pop(next(iter(_route_cache)))
+            _route_cache[cache_key] = (now + ttl, flight_options)
 
-        except ResponseError as error:
-            logger.warning(f"No flights on {origin_code} -> {dest_code}: {error.response.status_code}")
-            # Always log error details to diagnose issues
-            logger.error(f"Error details: {error.response.body}")
-            return []
-        except Exception as e:
-            logger.error(f"Unexpected error searching {origin_code} -> {dest_code}: {e}")
+        return list(flight_options)
+
+    def _search_route_uncached(
+        self,
+        origin_code: str,
+        dest_code: str,
+        intent: TravelIntent,
+        max_results: int
+    ) -> List[FlightOption]:
+        """Issue the actual Amadeus query for one route"""
+        # Build search parameters
+        search_params = {
+            'originLocationCode': origin_code,
+            'destinationLocationCode': dest_code,
+            'departureDate': intent.departure_date.isoformat(),
+            'returnDate': intent.return_date.isoformat(),
+            'adults': intent.num_adults,
+            'max': max_results,
+            'currencyCode': 'EUR'
+        }
+
+        # Only include children parameter if there are children
+        if intent.num_children > 0:
+            search_params['children'] = intent.num_children
+
+        # Search for round-trip flights, pacing outbound calls through the
+        # token bucket and retrying rate-limit/unavailable responses with
+        # jittered backoff - a transient 429 should not read as "no flights"
+        for attempt in range(_MAX_RETRIES + 1):
+            _RATE_LIMITER.acquire()
+            try:
+                response = self.client.shopping.flight_offers_search.get(**search_params)
+                break
+            except ResponseError as error:
+                status = error.response.status_code
+                if status in (429, 503) and attempt < _MAX_RETRIES:
+                    headers = getattr(error.response, 'headers', None) or {}
+                    try:
+                        retry_after = float(headers.get('Retry-After', 0))
+                    except (TypeError, ValueError):
+                        retry_after = 0.0
+                    delay = max(retry_after, _BACKOFF_BASE * 2 ** attempt) + random.uniform(0, 0.25)
+                    logger.warning("Rate limited (%s) on %s -> %s, retry in %.1fs", status, origin_code, dest_code, delay)
+                    time.sleep(delay)
+                    continue
+                logger.warning("No flights on %s -> %s: %s", origin_code, dest_code, status)
+                # Always log error details to diagnose issues
+                logger.error("Error details: %s", error.response.body)
+                return []
+            except Exception as e:
+                logger.error("Unexpected error searching %s -> %s: %s", origin_code, dest_code, e)
+                return []
+        else:
+            logger.error("Rate-limit retries exhausted for %s -> %s", origin_code, dest_code)
             return []
 
+        # Parse response into FlightOption objects. islice caps the work at
+        # max_results even when the API returns more offers than asked for,
+        # so parsing cost is bounded by what callers will actually consume
+        flight_options = []
+        for offer in islice(response.data, max_results):
+            try:
+                flight_option = self._parse_flight_offer(offer)
+                flight_options.append(flight_option)
+            except Exception as e:
+                logger.error("Error parsing flight offer: %s", e)
+                continue
+
+        return flight_options
+
     def _get_alternative_airports(self, city: str, primary_code: str) -> List[str]:
         """
         Get alternative airport codes for a city.
         Returns list of alternative IATA codes to try.
         """
-        # Strip country if present
-        if ',' in city:
-            city = city.split(',')[0].strip()
-
-        city_lower = city.lower().strip()
-
-        # Map cities to alternative airports
-        alternatives = {
-            # Japan - multiple airport options
-            "kyoto": ["OSA", "ITM", "UKB"],  # Osaka region: Kansai, Itami, Kobe
-            "osaka": ["ITM", "UKB"],  # Also try Itami and Kobe besides Kansai
-            "tokyo": ["NRT", "HND"],  # Narita and Haneda
-
-            # Europe - cities with multiple airports
-            "london": ["LHR", "LGW", "STN", "LTN"],  # Heathrow, Gatwick, Stansted, Luton
-            "paris": ["CDG", "ORY"],  # Charles de Gaulle, Orly
-            "rome": ["FCO", "CIA"],  # Fiumicino, Ciampino
-            "milan": ["MXP", "LIN", "BGY"],  # Malpensa, Linate, Bergamo
-            "barcelona": ["BCN", "GRO"],  # El Prat, Girona
-
-            # North America
-            "new york": ["JFK", "EWR", "LGA"],  # JFK, Newark, LaGuardia
-            "los angeles": ["LAX", "BUR", "ONT"],
-            "chicago": ["ORD", "MDW"],
-            "san francisco": ["SFO", "OAK", "SJC"],
-
-            # Asia
-            "bangkok": ["BKK", "DMK"],  # Suvarnabhumi, Don Mueang
-            "seoul": ["ICN", "GMP"],  # Incheon, Gimpo
-            "shanghai": ["PVG", "SHA"],  # Pudong, Hongqiao
-            "beijing": ["PEK", "PKX"],  # Capital, Daxing
-        }
+        city_lower = _normalize_city(city)
+
+        # Curated table first for instant hits, then data-driven discovery
+        # so cities outside the table still get a fallback list
+        alternatives = _ALT_AIRPORTS.get(city_lower)
+        if alternatives is not None:
+            return alternatives
+
+        return [
+            code for code in self._discover_airports(city_lower)
+            if code != primary_code
+        ]
+
+    def _discover_airports(self, city_name: str) -> Tuple[str, ...]:
+        """
+        Discover airports for a city via the Amadeus locations API,
+        ranked by traveler score. Cached per city for the service's
+        lifetime, so steady-state lookups are a dict hit.
+        """
+        cached = self._airport_discovery_cache.get(city_name)
+        if cached is not None:
+            return cached
 
-        return alternatives.get(city_lower, [])
+        codes: Tuple[str, ...] = ()
+        try:
+            response = self.client.reference_data.locations.get(
+                keyword=city_name,
+                subType="AIRPORT",
+                sort="analytics.travelers.score",
+                page={'limit': 5}
+            )
+            codes = tuple(loc['iataCode'] for loc in response.data)
+        except ResponseError as error:
+            logger.warning("Airport discovery failed for %s: %s", city_name, error)
+        except Exception as e:
+            logger.error("Unexpected error discovering airports for %s: %s", city_name, e)
+
+        if len(self._airport_discovery_cache) >= 2048:
+            self._airport_discovery_cache.pop(next(iter(self._airport_discovery_cache)))
+        self._airport_discovery_cache[city_name] = codes
+        return codes
 
     def _parse_flight_offer(self, offer: dict) -> FlightOption:
         """Parse Amadeus flight offer into FlightOption model"""
@@ -201,15 +646,19 @@ class AmadeusFlightService:
         # Parse return (second itinerary)
         return_segments = self._parse_segments(itineraries[1]['segments'])
 
-        # Calculate total duration
-        total_duration = sum(
-            seg.duration_minutes for seg in outbound_segments + return_segments
+        # Calculate total duration - two generator sums, no concatenated
+        # throwaway list per offer
+        total_duration = (
+            sum(seg.duration_minutes for seg in outbound_segments)
+            + sum(seg.duration_minutes for seg in return_segments)
         )
 
         # Count stops
-        num_stops = (len(outbound_segments) - 1) + (len(return_segments) - 1)
+        num_stops = len(outbound_segments) + len(return_segments) - 2
 
-        return FlightOption(
+        # The fields are already coerced to their target types above, so
+        # model_construct skips a redundant validation pass per offer
+        return FlightOption.model_construct(
             outbound_segments=outbound_segments,
             return_segments=return_segments,
             total_price=float(price['total']),
@@ -217,49 +666,49 @@ class AmadeusFlightService:
             total_duration_minutes=total_duration,
             number_of_stops=num_stops,
             booking_link=None,  # Amadeus doesn't provide direct booking links
-            source="amadeus"
+            source="amadeus",
+            last_updated=datetime.now()
         )
 
     def _parse_segments(self, segments: List[dict]) -> List[FlightSegment]:
         """Parse flight segments from Amadeus response"""
+        # Bind the loop invariants to locals once - this runs per segment
+        # across every candidate offer, so the repeated global/attribute
+        # lookups are worth eliminating. fromisoformat handles the trailing
+        # 'Z' natively on Python 3.11+ (the project floor).
+        # model_construct: every field below is hand-coerced to its target
+        # type already, so pydantic validation per segment is pure overhead
+        fromiso = datetime.fromisoformat
+        parse_duration = self._parse_duration
+        make_segment = FlightSegment.model_construct
         parsed_segments = []
 
         for segment in segments:
-            departure = datetime.fromisoformat(segment['departure']['at'].replace('Z', '+00:00'))
-            arrival = datetime.fromisoformat(segment['arrival']['at'].replace('Z', '+00:00'))
-
-            duration_str = segment['duration']  # Format: PT2H30M
-            duration_minutes = self._parse_duration(duration_str)
-
-            parsed_segments.append(FlightSegment(
-                origin=segment['departure']['iataCode'],
-                destination=segment['arrival']['iataCode'],
-                departure=departure,
-                arrival=arrival,
+            dep = segment['departure']
+            arr = segment['arrival']
+            aircraft = segment.get('aircraft')
+            parsed_segments.append(make_segment(
+                origin=dep['iataCode'],
+                destination=arr['iataCode'],
+                departure=fromiso(dep['at']),
+                arrival=fromiso(arr['at']),
                 carrier=segment['carrierCode'],
                 flight_number=segment['number'],
-                duration_minutes=duration_minutes,
-                aircraft=segment.get('aircraft', {}).get('code'),
+                duration_minutes=parse_duration(segment['duration']),  # PT2H30M
+                aircraft=aircraft.get('code') if aircraft else None,
                 booking_class=segment.get('cabin', 'economy').lower()
             ))
 
         return parsed_segments
 
-    def _parse_duration(self, duration_str: str) -> int:
+    @staticmethod
+    def _parse_duration(duration_str: str) -> int:
         """Parse ISO 8601 duration (PT2H30M) to minutes"""
-        import re
-        hours = 0
-        minutes = 0
-
-        hour_match = re.search(r'(\d+)H', duration_str)
-        if hour_match:
-            hours = int(hour_match.group(1))
-
-        minute_match = re.search(r'(\d+)M', duration_str)
-        if minute_match:
-            minutes = int(minute_match.group(1))
-
-        return hours * 60 + minutes
+        match = _DURATION_RE.match(duration_str)
+        if not match:
+            return 0
+        hours, minutes = match.groups()
+        return (int(hours) if hours else 0) * 60 + (int(minutes) if minutes else 0)
 
     def _get_iata_code(self, location: str) -> str:
         """
@@ -267,143 +716,20 @@ class AmadeusFlightService:
         In production, use a proper geocoding service or IATA lookup.
         For MVP, handle common cases.
         """
-        # Strip country names (e.g., "Rome, Italy" -> "Rome")
-        if ',' in location:
-            location = location.split(',')[0].strip()
-
-        common_codes = {
-            # Major European Cities
-            "london": "LON",
-            "paris": "PAR",
-            "rome": "ROM",
-            "barcelona": "BCN",
-            "madrid": "MAD",
-            "berlin": "BER",
-            "amsterdam": "AMS",
-            "lisbon": "LIS",
-            "copenhagen": "CPH",
-            "stockholm": "STO",
-            "oslo": "OSL",
-            "helsinki": "HEL",
-            "vienna": "VIE",
-            "prague": "PRG",
-            "budapest": "BUD",
-            "warsaw": "WAW",
-            "dublin": "DUB",
-            "athens": "ATH",
-            "istanbul": "IST",
-
-            # Beach Destinations
-            "nice": "NCE",
-            "cannes": "NCE",  # Uses Nice airport
-            "valencia": "VLC",
-            "malaga": "AGP",
-            "alicante": "ALC",
-            "palma": "PMI",
-            "ibiza": "IBZ",
-            "mykonos": "JMK",
-            "santorini": "JTR",
-            "split": "SPU",
-            "dubrovnik": "DBV",
-            "faro": "FAO",
-            "porto": "OPO",
-
-            # Additional European
-            "milan": "MIL",
-            "venice": "VCE",
-            "florence": "FLR",
-            "naples": "NAP",
-            "zurich": "ZRH",
-            "geneva": "GVA",
-            "brussels": "BRU",
-            "lyon": "LYS",
-            "marseille": "MRS",
-            "edinburgh": "EDI",
-            "manchester": "MAN",
-            "munich": "MUC",
-            "frankfurt": "FRA",
-            "hamburg": "HAM",
-
-            # International
-            "new york": "NYC",
-            "los angeles": "LAX",
-            "san francisco": "SFO",
-            "chicago": "CHI",
-            "miami": "MIA",
-            "orlando": "MCO",
-            "las vegas": "LAS",
-
-            # Japan
-            "tokyo": "TYO",
-            "kyoto": "KIX",  # Uses Osaka Kansai International Airport
-            "osaka": "KIX",  # Kansai International Airport
-            "yokohama": "TYO",  # Uses Tokyo airports
-            "nagoya": "NGO",
-            "sapporo": "SPK",
-            "fukuoka": "FUK",
-            "nara": "KIX",  # Uses Osaka Kansai (close to Kyoto)
-            "nagano": "TYO",  # Route through Tokyo (no international flights to Nagano)
-
-            # Other Asia-Pacific
-            "dubai": "DXB",
-            "singapore": "SIN",
-            "hong kong": "HKG",
-            "bangkok": "BKK",
-            "bali": "DPS",
-            "phuket": "HKT",
-            "seoul": "SEL",
-            "beijing": "BJS",
-            "shanghai": "SHA",
-            "delhi": "DEL",
-            "mumbai": "BOM",
-            "sydney": "SYD",
-            "melbourne": "MEL",
-
-            # Americas
-            "cancun": "CUN",
-            "mexico city": "MEX",
-            "rio de janeiro": "RIO",
-            "sao paulo": "SAO",
-            "buenos aires": "BUE",
-            "toronto": "YTO",
-            "vancouver": "YVR",
-            "montreal": "YMQ",
-
-            # Canary Islands
-            "tenerife": "TCI",
-            "gran canaria": "LPA",
-            "lanzarote": "ACE",
-
-            # Small cities without international airports (route through hubs)
-            "takayama": "TYO",  # Japan - route through Tokyo
-            "hakone": "TYO",  # Japan - route through Tokyo
-            "nikko": "TYO",  # Japan - route through Tokyo
-            "kanazawa": "TYO",  # Japan - route through Tokyo
-            "kobe": "KIX",  # Japan - route through Osaka
-            "siena": "ROM",  # Italy - route through Rome or Florence
-            "assisi": "ROM",  # Italy - route through Rome
-            "verona": "MIL",  # Italy - route through Milan
-            "bologna": "MIL",  # Italy - route through Milan
-            "cinque terre": "MIL",  # Italy - route through Milan
-            "positano": "NAP",  # Italy - route through Naples
-            "granada": "MAD",  # Spain - route through Madrid
-            "san sebastian": "MAD",  # Spain - route through Madrid
-            "seville": "MAD",  # Spain - route through Madrid
-            "tours": "PAR",  # France - route through Paris
-            "avignon": "PAR",  # France - route through Paris
-            "annecy": "PAR",  # France - route through Paris
-            "salzburg": "VIE",  # Austria - route through Vienna
-            "innsbruck": "VIE",  # Austria - route through Vienna
-        }
+        # Fast path: already a bare IATA code (common with frontend
+        # autocomplete) - checked before any partition/strip work
+        if len(location) == 3 and location.isalpha():
+            return location if location.isupper() else location.upper()
 
-        location_lower = location.lower().strip()
+        # Strip country names (e.g., "Rome, Italy" -> "Rome")
+        city = location.partition(',')[0].strip()
 
-        # If already an IATA code (3 letters), return as-is
-        if len(location) == 3 and location.isalpha():
-            return location.upper()
+        # Codes can also arrive with a country suffix ("FCO, Italy")
+        if len(city) == 3 and city.isalpha():
+            return city.upper()
 
-        # Look up in common codes
-        return common_codes.get(location_lower, location.upper()[:3])
+        # Look up in the module-level code table
+        return _IATA_CODES.get(city.casefold(), city.upper()[:3])
 
     def get_airport_suggestions(self, query: str, max_results: int = 5) -> List[dict]:
         """
@@ -427,5 +753,5 @@ class AmadeusFlightService:
                 for loc in response.data
             ]
         except ResponseError as error:
-            logger.error(f"Airport search error: {error}")
+            logger.error("Airport search error: %s", error)
             return []
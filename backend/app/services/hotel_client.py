@@ -3,9 +3,16 @@ Hotel Search Service
 Supports multiple hotel APIs (Hotelbeds, Amadeus, Booking.com via RapidAPI)
 For MVP, includes mock data generator for testing.
 """
+import asyncio
+import functools
+import random
+import re
 from datetime import date, datetime
+from operator import itemgetter
+from types import MappingProxyType
 from typing import List, Optional, Dict
 import httpx
+import orjson
 import logging
 import hashlib
 import time
@@ -14,8 +21,22 @@ from app.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Star count in Hotelbeds category names like "4 STARS", compiled once
+# instead of per parsed hotel
+_STAR_RE = re.compile(r'(\d+)')
 
-# Approximate exchange rates to EUR (updated periodically)
+# Price-multiplier range per mock hotel style, hoisted out of the
+# generation loop's if/elif chain
+_MOCK_PRICE_RANGE = MappingProxyType({
+    "luxury": (1.5, 2.5),
+    "budget": (0.5, 0.8),
+})
+_MOCK_PRICE_RANGE_DEFAULT = (0.9, 1.3)
+
+
+# Approximate exchange rates to EUR (updated periodically).
+# Keys are upper-case, so a lookup on the raw provider code hits without
+# paying .upper() for the (usual) already-normalized input
 CURRENCY_RATES_TO_EUR = {
     "EUR": 1.0,
     "USD": 0.92,
@@ -39,33 +60,171 @@ CURRENCY_RATES_TO_EUR = {
 }
 
 
+# City name -> IATA city code, built once at import with pre-normalized
+# keys (lowercase, no country suffix) instead of per lookup call
+_CITY_IATA = MappingProxyType({
+    # Europe
+    "paris": "PAR",
+    "rome": "ROM",
+    "barcelona": "BCN",
+    "london": "LON",
+    "amsterdam": "AMS",
+    "berlin": "BER",
+    "madrid": "MAD",
+    "vienna": "VIE",
+    "prague": "PRG",
+    "budapest": "BUD",
+    "lisbon": "LIS",
+    "dublin": "DUB",
+    "athens": "ATH",
+    "copenhagen": "CPH",
+    "stockholm": "STO",
+    "oslo": "OSL",
+    "helsinki": "HEL",
+    "warsaw": "WAW",
+    "brussels": "BRU",
+    "milan": "MIL",
+    "venice": "VCE",
+    "florence": "FLR",
+    "naples": "NAP",
+    "zurich": "ZRH",
+    "geneva": "GVA",
+
+    # Asia
+    "tokyo": "TYO",
+    "kyoto": "KIX",  # Osaka/Kyoto region
+    "osaka": "OSA",
+    "bangkok": "BKK",
+    "singapore": "SIN",
+    "hong kong": "HKG",
+    "dubai": "DXB",
+    "mumbai": "BOM",
+    "delhi": "DEL",
+    "seoul": "SEL",
+    "beijing": "BJS",
+    "shanghai": "SHA",
+
+    # Americas
+    "new york": "NYC",
+    "los angeles": "LAX",
+    "san francisco": "SFO",
+    "miami": "MIA",
+    "chicago": "CHI",
+    "boston": "BOS",
+    "toronto": "YTO",
+    "vancouver": "YVR",
+    "mexico city": "MEX",
+    "buenos aires": "BUE",
+    "rio de janeiro": "RIO",
+    "sao paulo": "SAO",
+
+    # Oceania
+    "sydney": "SYD",
+    "melbourne": "MEL",
+    "auckland": "AKL",
+
+    # Africa
+    "cape town": "CPT",
+    "johannesburg": "JNB",
+    "cairo": "CAI",
+    "marrakech": "RAK",
+})
+
+
+@functools.lru_cache(maxsize=512)
+def _city_iata_code(city: str) -> str:
+    """
+    City name to IATA city code. Cached on the raw input so repeated
+    lookups for the same destination string ("Tokyo, Japan") skip even
+    the strip/casefold normalization.
+    """
+    # Strip country name if present (e.g., "Tokyo, Japan" -> "Tokyo")
+    city = city.partition(',')[0].strip()
+    return _CITY_IATA.get(city.casefold(), city[:3].upper())
+
+
 class HotelSearchService:
     """
     Service for searching hotels across multiple providers.
     Supports: Amadeus (primary), Booking.com (via RapidAPI), mock data for testing.
     """
 
+    # Identical hotel searches repeat as users refine a plan or the UI
+    # re-requests; within the TTL a hit bypasses every provider API.
+    # Kept short because rates move.
+    _CACHE_TTL = 300.0
+    _CACHE_MAXSIZE = 512
+
+    # Hard wall-clock budget per provider. The per-request httpx timeouts
+    # (max 20s) only bound a single round-trip - a provider making serial
+    # calls could otherwise stall the race well past user patience. Kept
+    # above the request timeouts so httpx raises first and cleans up.
+    _PROVIDER_TIMEOUT = 25.0
+
     def __init__(self, use_mock: bool = False):
         self.use_mock = use_mock
         self.hotelbeds_api_key = settings.hotelbeds_api_key if hasattr(settings, 'hotelbeds_api_key') else None
         self.hotelbeds_api_secret = settings.hotelbeds_api_secret if hasattr(settings, 'hotelbeds_api_secret') else None
+        # SHA-256 state pre-seeded with the constant key+secret prefix;
+        # each signature copies it and hashes only the timestamp tail.
+        # Hotelbeds credentials are ASCII, so encode through the narrow
+        # ASCII path rather than the general UTF-8 encoder.
+        if self.hotelbeds_api_key and self.hotelbeds_api_secret:
+            self._hb_hasher_base = hashlib.sha256(
+                (self.hotelbeds_api_key + self.hotelbeds_api_secret).encode('ascii')
+            )
+        else:
+            self._hb_hasher_base = None
         self.amadeus_api_key = settings.amadeus_api_key
         self.amadeus_api_secret = settings.amadeus_api_secret
         self.amadeus_access_token = None
+        # Amadeus tokens expire (~30 min); track when and serialize the
+        # refresh so concurrent searches don't stampede the OAuth endpoint
+        self._amadeus_token_expires_at = 0.0
+        self._amadeus_token_lock = asyncio.Lock()
         self.rapidapi_key = settings.booking_com_api_key if hasattr(settings, 'booking_com_api_key') else None
 
+        # Result cache plus in-flight futures so concurrent identical
+        # searches coalesce into a single provider fan-out (single-flight)
+        self._result_cache: Dict[tuple, tuple] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+        # One long-lived client shared by every provider call: keep-alive
+        # connections skip the TCP+TLS handshake (the dominant per-request
+        # cost here) on every call after the first to each host. HTTP/2
+        # (negotiated via ALPN where the provider supports it) multiplexes
+        # the by-city call and the concurrent offers chunks over a single
+        # connection instead of one TCP stream each.
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30,
+            ),
+            timeout=httpx.Timeout(20.0, connect=5.0),
+        )
+
+    async def aclose(self) -> None:
+        """Release the shared HTTP client (called on application shutdown)"""
+        await self._http_client.aclose()
+
     def _convert_to_eur(self, amount: float, from_currency: str) -> float:
         """Convert amount from given currency to EUR"""
+        # Runs once per parsed hotel - keep the common path to a dict
+        # probe and a multiply, with no eager string formatting
         if from_currency == "EUR":
             return amount
 
-        rate = CURRENCY_RATES_TO_EUR.get(from_currency.upper())
-        if not rate:
-            logger.warning(f"No exchange rate for {from_currency}, using amount as-is")
+        rate = CURRENCY_RATES_TO_EUR.get(from_currency)
+        if rate is None:
+            rate = CURRENCY_RATES_TO_EUR.get(from_currency.upper())
+        if rate is None:
+            logger.warning("No exchange rate for %s, using amount as-is", from_currency)
             return amount
 
         converted = amount * rate
-        logger.info(f"💱 Currency conversion: {amount:,.2f} {from_currency} = {converted:,.2f} EUR")
+        logger.debug("💱 Currency conversion: %.2f %s = %.2f EUR", amount, from_currency, converted)
         return converted
 
     async def search_hotels(
@@ -86,141 +245,163 @@ class HotelSearchService:
             logger.info("Using mock hotel data (explicitly requested)")
             return self._generate_mock_hotels(intent, max_results)
 
-        # Try Hotelbeds first (best coverage and real addresses)
-        if self.hotelbeds_api_key and self.hotelbeds_api_secret:
-            try:
-                logger.info("🔍 Trying Hotelbeds API...")
-                hotels = await self._search_hotelbeds(intent, max_results)
-                if hotels:
-                    logger.info(f"✅ Hotelbeds success: Found {len(hotels)} hotels")
-                    return hotels
-                logger.warning("⚠️  Hotelbeds returned 0 hotels")
-            except Exception as e:
-                logger.warning(f"⚠️  Hotelbeds failed: {e}")
-
-        # Fallback to Amadeus
+        # Key on the normalized search inputs - anything the providers'
+        # answers depend on
+        key = (
+            _city_iata_code(intent.destination),
+            intent.departure_date,
+            intent.return_date,
+            intent.num_adults,
+            intent.num_children,
+            max_results,
+        )
+        hit = self._result_cache.get(key)
+        if hit and hit[0] > time.monotonic():
+            logger.info("🗄️  Hotel search cache hit for %s", key[0])
+            # Refresh recency so eviction drops the least recently used query
+            del self._result_cache[key]
+            self._result_cache[key] = hit
+            return list(hit[1])
+
+        # Single-flight: later identical searches join the first caller's
+        # in-flight fan-out and share its outcome (even an empty one)
+        # instead of issuing their own provider calls. The shield keeps a
+        # cancelled waiter from cancelling the shared future under the
+        # owner's feet.
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info("🔁 Joining in-flight hotel search for %s", key[0])
+            return list(await asyncio.shield(inflight))
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
         try:
-            logger.info("🔍 Trying Amadeus Hotel Search...")
-            hotels = await self._search_amadeus_hotels(intent, max_results)
+            hotels = await self._search_providers(intent, max_results)
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so the loop doesn't warn if no waiter joined
+                future.exception()
+            raise
+        else:
+            if not future.done():
+                future.set_result(hotels)
             if hotels:
-                logger.info(f"✅ Amadeus Hotels success: Found {len(hotels)} hotels")
-                return hotels
-            logger.warning("⚠️  Amadeus returned 0 hotels")
-        except Exception as e:
-            logger.warning(f"⚠️  Amadeus Hotels failed: {e}")
-
-        # Fallback to Booking.com if available
+                if len(self._result_cache) >= self._CACHE_MAXSIZE:
+                    self._result_cache.pop(next(iter(self._result_cache)))
+                self._result_cache[key] = (time.monotonic() + self._CACHE_TTL, hotels)
+            return list(hotels)
+        finally:
+            del self._inflight[key]
+
+    async def _budgeted(self, coro):
+        """Run one provider search under the hard per-provider time budget"""
+        async with asyncio.timeout(self._PROVIDER_TIMEOUT):
+            return await coro
+
+    async def _search_providers(
+        self,
+        intent: TravelIntent,
+        max_results: int
+    ) -> List[AccommodationOption]:
+        """Race the configured providers and return the first useful result"""
+        # Fire every configured provider concurrently instead of walking
+        # the old sequential fallback chain - each fallback used to pay the
+        # full latency of the provider before it. Providers are listed in
+        # preference order (Hotelbeds has the best coverage and real
+        # addresses); the first non-empty result wins, with ties in the
+        # same wake-up broken by that order, and the losers are cancelled.
+        providers: List[tuple] = []
+        if self.hotelbeds_api_key and self.hotelbeds_api_secret:
+            providers.append(
+                ("Hotelbeds", self._budgeted(self._search_hotelbeds(intent, max_results)))
+            )
+        providers.append(
+            ("Amadeus Hotels", self._budgeted(self._search_amadeus_hotels(intent, max_results)))
+        )
         if self.rapidapi_key:
-            logger.info("🔍 Falling back to Booking.com...")
-            return await self._search_booking_com(intent, max_results)
-
-        # Otherwise use mock data
-        logger.warning("⚠️  No hotel API available, using mock data")
+            providers.append(
+                ("Booking.com", self._budgeted(self._search_booking_com(intent, max_results)))
+            )
+
+        logger.info("🔍 Querying %d hotel providers in parallel", len(providers))
+        tasks = [asyncio.ensure_future(coro) for _, coro in providers]
+        task_names = {task: name for task, (name, _) in zip(tasks, providers)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task not in done:
+                        continue
+                    name = task_names[task]
+                    try:
+                        hotels = task.result()
+                    except Exception as e:
+                        logger.warning("⚠️  %s failed: %s", name, e)
+                        continue
+                    if hotels:
+                        logger.info("✅ %s success: Found %d hotels", name, len(hotels))
+                        return hotels
+                    logger.warning("⚠️  %s returned 0 hotels", name)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Every provider failed or came back empty - fall back to mock data
+        logger.warning("⚠️  No hotel API returned results, using mock data")
         return self._generate_mock_hotels(intent, max_results)
 
     async def _get_amadeus_token(self) -> str:
-        """Get Amadeus API access token (cached)"""
-        if self.amadeus_access_token:
+        """Get Amadeus API access token, cached until shortly before expiry"""
+        # The old cache held the token forever, so after ~30 minutes every
+        # request 401'd and paid a failed call plus a re-auth round-trip
+        if self.amadeus_access_token and time.monotonic() < self._amadeus_token_expires_at:
             return self.amadeus_access_token
 
-        url = "https://test.api.amadeus.com/v1/security/oauth2/token"
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": self.amadeus_api_key,
-            "client_secret": self.amadeus_api_secret
-        }
+        async with self._amadeus_token_lock:
+            # Another coroutine may have refreshed while we waited
+            if self.amadeus_access_token and time.monotonic() < self._amadeus_token_expires_at:
+                return self.amadeus_access_token
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=data, timeout=10.0)
+            url = "https://test.api.amadeus.com/v1/security/oauth2/token"
+            data = {
+                "grant_type": "client_credentials",
+                "client_id": self.amadeus_api_key,
+                "client_secret": self.amadeus_api_secret
+            }
+
+            response = await self._http_client.post(url, data=data, timeout=10.0)
             response.raise_for_status()
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             self.amadeus_access_token = token_data["access_token"]
+            # Refresh a minute early so in-flight requests never carry a
+            # token that expires mid-call
+            self._amadeus_token_expires_at = (
+                time.monotonic() + float(token_data.get("expires_in", 1799)) - 60.0
+            )
             return self.amadeus_access_token
 
     def _get_city_iata_code(self, city: str) -> str:
         """Convert city name to IATA city code for hotel search"""
-        # Strip country name if present (e.g., "Tokyo, Japan" -> "Tokyo")
-        if ',' in city:
-            city = city.split(',')[0].strip()
-
-        # Common city mappings (IATA city codes)
-        city_codes = {
-            # Europe
-            "paris": "PAR",
-            "rome": "ROM",
-            "barcelona": "BCN",
-            "london": "LON",
-            "amsterdam": "AMS",
-            "berlin": "BER",
-            "madrid": "MAD",
-            "vienna": "VIE",
-            "prague": "PRG",
-            "budapest": "BUD",
-            "lisbon": "LIS",
-            "dublin": "DUB",
-            "athens": "ATH",
-            "copenhagen": "CPH",
-            "stockholm": "STO",
-            "oslo": "OSL",
-            "helsinki": "HEL",
-            "warsaw": "WAW",
-            "brussels": "BRU",
-            "milan": "MIL",
-            "venice": "VCE",
-            "florence": "FLR",
-            "naples": "NAP",
-            "zurich": "ZRH",
-            "geneva": "GVA",
-
-            # Asia
-            "tokyo": "TYO",
-            "kyoto": "KIX",  # Osaka/Kyoto region
-            "osaka": "OSA",
-            "bangkok": "BKK",
-            "singapore": "SIN",
-            "hong kong": "HKG",
-            "dubai": "DXB",
-            "mumbai": "BOM",
-            "delhi": "DEL",
-            "seoul": "SEL",
-            "beijing": "BJS",
-            "shanghai": "SHA",
-
-            # Americas
-            "new york": "NYC",
-            "los angeles": "LAX",
-            "san francisco": "SFO",
-            "miami": "MIA",
-            "chicago": "CHI",
-            "boston": "BOS",
-            "toronto": "YTO",
-            "vancouver": "YVR",
-            "mexico city": "MEX",
-            "buenos aires": "BUE",
-            "rio de janeiro": "RIO",
-            "sao paulo": "SAO",
-
-            # Oceania
-            "sydney": "SYD",
-            "melbourne": "MEL",
-            "auckland": "AKL",
-
-            # Africa
-            "cape town": "CPT",
-            "johannesburg": "JNB",
-            "cairo": "CAI",
-            "marrakech": "RAK",
-        }
-
-        city_lower = city.lower().strip()
-        return city_codes.get(city_lower, city[:3].upper())
+        return _city_iata_code(city)
+
+    @staticmethod
+    def _nights(intent: TravelIntent) -> int:
+        """Stay length in nights, computed once per search and threaded
+        into the per-hotel parsers instead of re-subtracting dates there"""
+        if intent.departure_date and intent.return_date:
+            return (intent.return_date - intent.departure_date).days
+        return intent.duration_days or 7
 
     def _get_hotelbeds_signature(self) -> tuple[str, str]:
         """Generate X-Signature header for Hotelbeds API"""
         timestamp = str(int(time.time()))
-        signature_string = self.hotelbeds_api_key + self.hotelbeds_api_secret + timestamp
-        signature = hashlib.sha256(signature_string.encode()).hexdigest()
-        return signature, timestamp
+        hasher = self._hb_hasher_base.copy()
+        # The timestamp is pure digits; the ascii codec is the cheapest
+        # str->bytes path for it
+        hasher.update(timestamp.encode('ascii'))
+        return hasher.hexdigest(), timestamp
 
     async def _search_hotelbeds(
         self,
@@ -229,11 +410,15 @@ class HotelSearchService:
     ) -> List[AccommodationOption]:
         """Search hotels using Hotelbeds API"""
         try:
-            # Calculate nights
-            if intent.departure_date and intent.return_date:
-                nights = (intent.return_date - intent.departure_date).days
-            else:
-                nights = intent.duration_days or 7
+            # Validate dates up front - the API rejects a null stay anyway,
+            # so fail before paying for the request. isoformat runs once
+            # here instead of conditionally inside the payload literal.
+            if not intent.departure_date or not intent.return_date:
+                logger.warning("Missing dates for Hotelbeds search")
+                return []
+            check_in = intent.departure_date.isoformat()
+            check_out = intent.return_date.isoformat()
+            nights = self._nights(intent)
 
             # Get signature
             signature, timestamp = self._get_hotelbeds_signature()
@@ -251,8 +436,8 @@ class HotelSearchService:
             # Hotelbeds uses specific destination codes
             search_payload = {
                 "stay": {
-                    "checkIn": intent.departure_date.isoformat() if intent.departure_date else None,
-                    "checkOut": intent.return_date.isoformat() if intent.return_date else None
+                    "checkIn": check_in,
+                    "checkOut": check_out
                 },
                 "occupancies": [
                     {
@@ -268,31 +453,31 @@ class HotelSearchService:
 
             url = "https://api.test.hotelbeds.com/hotel-api/1.0/hotels"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=search_payload,
-                    headers=headers,
-                    timeout=20.0
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                hotels = []
-                for hotel_data in data.get("hotels", {}).get("hotels", [])[:max_results]:
-                    try:
-                        accommodation = self._parse_hotelbeds_hotel(hotel_data, intent, nights)
-                        hotels.append(accommodation)
-                    except Exception as e:
-                        logger.error(f"Error parsing Hotelbeds hotel '{hotel_data.get('name', 'Unknown')}': {e}")
-                        logger.debug(f"Hotel data: {hotel_data}")
-                        continue
-
-                logger.info(f"✅ Parsed {len(hotels)} hotels from Hotelbeds")
-                return hotels
+            response = await self._http_client.post(
+                url,
+                json=search_payload,
+                headers=headers,
+                timeout=20.0
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            hotels = []
+            for hotel_data in data.get("hotels", {}).get("hotels", [])[:max_results]:
+                try:
+                    accommodation = self._parse_hotelbeds_hotel(hotel_data, intent, nights)
+                    hotels.append(accommodation)
+                except Exception as e:
+                    logger.error("Error parsing Hotelbeds hotel '%s': %s", hotel_data.get("name", "Unknown"), e)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Hotel data: %s", hotel_data)
+                    continue
+
+            logger.info("✅ Parsed %d hotels from Hotelbeds", len(hotels))
+            return hotels
 
         except Exception as e:
-            logger.error(f"❌ Hotelbeds search error: {e}")
+            logger.error("❌ Hotelbeds search error: %s", e)
             raise
 
     def _parse_hotelbeds_hotel(
@@ -325,21 +510,25 @@ class HotelSearchService:
         address = hotel_data.get("address", {})
 
         # Parse star rating (categoryName is string like "4 STARS" or "5 STARS")
-        category_name = hotel_data.get("categoryName", "")
+        category_name = str(hotel_data.get("categoryName", ""))
         rating = None
         if category_name:
-            # Extract number from strings like "4 STARS", "5 STARS"
-            import re
-            match = re.search(r'(\d+)', str(category_name))
-            if match:
-                star_rating = int(match.group(1))
-                # Convert 1-5 stars to 2.0-5.0 rating (5 stars = 5.0, 4 stars = 4.0, etc.)
-                rating = float(star_rating) if 1 <= star_rating <= 5 else None
-
-        # Amenities
-        amenities = []
-        for facility in hotel_data.get("facilities", [])[:8]:
-            amenities.append(facility.get("description", ""))
+            # The usual shape leads with the digit, so try the first
+            # character before falling back to the regex scan
+            first = category_name[:1]
+            if first.isdigit():
+                star_rating = int(first)
+            else:
+                match = _STAR_RE.search(category_name)
+                star_rating = int(match.group(1)) if match else 0
+            # Convert 1-5 stars to 2.0-5.0 rating (5 stars = 5.0, 4 stars = 4.0, etc.)
+            rating = float(star_rating) if 1 <= star_rating <= 5 else None
+
+        # Amenities - comprehension instead of a per-item append loop
+        amenities = [
+            facility.get("description", "")
+            for facility in hotel_data.get("facilities", ())[:8]
+        ]
 
         return AccommodationOption(
             name=name,
@@ -373,18 +562,21 @@ class HotelSearchService:
         Uses Hotel List + Hotel Offers APIs for comprehensive results.
         """
         try:
+            # Validate dates before spending the token and by-city calls -
+            # the offers request requires both
+            if not intent.departure_date or not intent.return_date:
+                logger.warning("Missing dates for Amadeus hotel search")
+                return []
+            check_in = intent.departure_date.isoformat()
+            check_out = intent.return_date.isoformat()
+            nights = self._nights(intent)
+
             token = await self._get_amadeus_token()
             headers = {"Authorization": f"Bearer {token}"}
 
             # Get city code
             city_code = self._get_city_iata_code(intent.destination)
-            logger.info(f"🏨 Searching hotels in {intent.destination} (code: {city_code})")
-
-            # Calculate nights
-            if intent.departure_date and intent.return_date:
-                nights = (intent.return_date - intent.departure_date).days
-            else:
-                nights = intent.duration_days or 7
+            logger.info("🏨 Searching hotels in %s (code: %s)", intent.destination, city_code)
 
             # Step 1: Search for hotels in the city
             search_url = "https://test.api.amadeus.com/v1/reference-data/locations/hotels/by-city"
@@ -395,60 +587,76 @@ class HotelSearchService:
                 "hotelSource": "ALL"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    search_url,
-                    params=search_params,
-                    headers=headers,
-                    timeout=15.0
-                )
-                response.raise_for_status()
-                hotels_data = response.json()
-
-                hotel_ids = [h["hotelId"] for h in hotels_data.get("data", [])[:50]]
-
-                if not hotel_ids:
-                    logger.warning(f"No hotels found in {city_code}")
-                    return []
-
-                logger.info(f"Found {len(hotel_ids)} hotels, getting offers...")
-
-                # Step 2: Get offers for these hotels
-                offers_url = "https://test.api.amadeus.com/v3/shopping/hotel-offers"
-                offers_params = {
-                    "hotelIds": ",".join(hotel_ids[:20]),  # Max 20 hotels per request
-                    "adults": intent.num_adults,
-                    "checkInDate": intent.departure_date.isoformat() if intent.departure_date else None,
-                    "checkOutDate": intent.return_date.isoformat() if intent.return_date else None,
-                    "roomQuantity": 1,
-                    "currency": "EUR",
-                    "bestRateOnly": "true"
-                }
+            response = await self._http_client.get(
+                search_url,
+                params=search_params,
+                headers=headers,
+                timeout=15.0
+            )
+            response.raise_for_status()
+            hotels_data = orjson.loads(response.content)
+
+            hotel_ids = [h["hotelId"] for h in hotels_data.get("data", [])[:50]]
+
+            if not hotel_ids:
+                logger.warning("No hotels found in %s", city_code)
+                return []
+
+            logger.info("Found %d hotels, getting offers...", len(hotel_ids))
+
+            # Step 2: Get offers for these hotels. The offers API caps at
+            # 20 hotel IDs per request, so instead of pricing only the
+            # first 20, chunk all the IDs and dispatch the requests
+            # concurrently - the round-trips overlap on the shared client
+            offers_url = "https://test.api.amadeus.com/v3/shopping/hotel-offers"
+            offers_params = {
+                "adults": intent.num_adults,
+                "checkInDate": check_in,
+                "checkOutDate": check_out,
+                "roomQuantity": 1,
+                "currency": "EUR",
+                "bestRateOnly": "true"
+            }
 
-                response = await client.get(
-                    offers_url,
-                    params=offers_params,
-                    headers=headers,
-                    timeout=20.0
-                )
-                response.raise_for_status()
-                offers_data = response.json()
-
-                # Parse results
-                hotels = []
-                for hotel_offer in offers_data.get("data", []):
+            chunks = [hotel_ids[i:i + 20] for i in range(0, len(hotel_ids), 20)]
+            responses = await asyncio.gather(
+                *(
+                    self._http_client.get(
+                        offers_url,
+                        params={**offers_params, "hotelIds": ",".join(chunk)},
+                        headers=headers,
+                        timeout=20.0
+                    )
+                    for chunk in chunks
+                ),
+                return_exceptions=True
+            )
+
+            # Parse results; a failed chunk drops its 20 hotels but doesn't
+            # sink the chunks that did come back
+            hotels = []
+            for response in responses:
+                if isinstance(response, BaseException):
+                    logger.warning("⚠️  Amadeus offers chunk failed: %s", response)
+                    continue
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    logger.warning("⚠️  Amadeus offers chunk failed: %s", e)
+                    continue
+                for hotel_offer in orjson.loads(response.content).get("data", []):
                     try:
                         accommodation = self._parse_amadeus_hotel(hotel_offer, intent, nights)
                         hotels.append(accommodation)
                     except Exception as e:
-                        logger.error(f"Error parsing Amadeus hotel: {e}")
+                        logger.error("Error parsing Amadeus hotel: %s", e)
                         continue
 
-                logger.info(f"✅ Parsed {len(hotels)} hotels with offers from Amadeus")
-                return hotels[:max_results]
+            logger.info("✅ Parsed %d hotels with offers from Amadeus", len(hotels))
+            return hotels[:max_results]
 
         except Exception as e:
-            logger.error(f"❌ Amadeus Hotel Search error: {e}")
+            logger.error("❌ Amadeus Hotel Search error: %s", e)
             raise
 
     def _parse_amadeus_hotel(
@@ -462,6 +670,13 @@ class HotelSearchService:
         offer = hotel_data.get("offers", [{}])[0]
         price_info = offer.get("price", {})
 
+        # Hoist the nested sub-dicts once instead of re-resolving them
+        # (and allocating throwaway defaults) at every read below
+        addr = hotel.get("address") or {}
+        room = offer.get("room") or {}
+        type_est = room.get("typeEstimated") or {}
+        category = type_est.get("category")
+
         # Get original price and currency
         original_currency = price_info.get("currency", "EUR")
         total_price_original = float(price_info.get("total", 0))
@@ -472,9 +687,8 @@ class HotelSearchService:
 
         # Extract amenities
         amenities = []
-        room = offer.get("room", {})
-        if room.get("typeEstimated", {}).get("category"):
-            amenities.append(room["typeEstimated"]["category"])
+        if category:
+            amenities.append(category)
         if offer.get("policies", {}).get("cancellation"):
             amenities.append("Free Cancellation")
 
@@ -484,16 +698,16 @@ class HotelSearchService:
         return AccommodationOption(
             name=name,
             type=hotel.get("type", "hotel"),
-            address=hotel.get("address", {}).get("lines", [""])[0] if hotel.get("address") else "",
+            address=addr.get("lines", [""])[0] if addr else "",
             city=intent.destination or "",
-            country=hotel.get("address", {}).get("countryCode", ""),
+            country=addr.get("countryCode", ""),
             price_per_night=round(price_per_night, 2),
             total_price=round(total_price, 2),
             currency="EUR",  # Always EUR after conversion
             rating=hotel.get("rating", 3.5),  # Amadeus doesn't provide ratings in test API
             review_count=None,
             amenities=amenities,
-            room_type=room.get("typeEstimated", {}).get("category", "Standard"),
+            room_type=category or "Standard",
             check_in=intent.departure_date or date.today(),
             check_out=intent.return_date or date.today(),
             latitude=hotel.get("latitude"),
@@ -513,13 +727,19 @@ class HotelSearchService:
         Docs: https://rapidapi.com/apidojo/api/booking
         """
         try:
+            # The API requires both dates; bail before the request and
+            # serialize them once
+            if not intent.departure_date or not intent.return_date:
+                logger.warning("Missing dates for Booking.com search")
+                return []
+
             url = "https://booking-com.p.rapidapi.com/v1/hotels/search"
 
             params = {
                 "dest_type": "city",
                 "dest_id": intent.destination,  # In production, resolve city to dest_id
-                "checkin_date": intent.departure_date.isoformat() if intent.departure_date else None,
-                "checkout_date": intent.return_date.isoformat() if intent.return_date else None,
+                "checkin_date": intent.departure_date.isoformat(),
+                "checkout_date": intent.return_date.isoformat(),
                 "adults_number": intent.num_adults,
                 "children_number": intent.num_children,
                 "room_number": 1,  # Can infer from travelers
@@ -534,39 +754,37 @@ class HotelSearchService:
                 "X-RapidAPI-Host": "booking-com.p.rapidapi.com"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, headers=headers, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
+            response = await self._http_client.get(url, params=params, headers=headers, timeout=10.0)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
-                hotels = []
-                for hotel in data.get('result', [])[:max_results]:
-                    try:
-                        accommodation = self._parse_booking_hotel(hotel, intent)
-                        hotels.append(accommodation)
-                    except Exception as e:
-                        logger.error(f"Error parsing hotel: {e}")
-                        continue
+            nights = self._nights(intent)
+            hotels = []
+            for hotel in data.get('result', [])[:max_results]:
+                try:
+                    accommodation = self._parse_booking_hotel(hotel, intent, nights)
+                    hotels.append(accommodation)
+                except Exception as e:
+                    logger.error("Error parsing hotel: %s", e)
+                    continue
 
-                logger.info(f"Found {len(hotels)} hotels from Booking.com")
-                return hotels
+            logger.info("Found %d hotels from Booking.com", len(hotels))
+            return hotels
 
         except Exception as e:
-            logger.error(f"Booking.com API error: {e}")
-            return self._generate_mock_hotels(intent, max_results)
+            # Return empty rather than mock data: this provider now races
+            # the others in search_hotels, and a mock result here would
+            # beat a real provider that is still in flight
+            logger.error("Booking.com API error: %s", e)
+            return []
 
     def _parse_booking_hotel(
         self,
         hotel: dict,
-        intent: TravelIntent
+        intent: TravelIntent,
+        nights: int
     ) -> AccommodationOption:
         """Parse Booking.com hotel data into AccommodationOption"""
-        # Calculate number of nights
-        if intent.departure_date and intent.return_date:
-            nights = (intent.return_date - intent.departure_date).days
-        else:
-            nights = intent.duration_days or 7
-
         price_per_night = float(hotel.get('min_total_price', 0)) / nights if nights > 0 else 0
 
         return AccommodationOption(
@@ -593,12 +811,13 @@ class HotelSearchService:
 
     def _extract_amenities(self, hotel: dict) -> List[str]:
         """Extract amenities from hotel data"""
-        amenities = []
-        facilities = hotel.get('hotel_facilities', '').split(',')
-        for facility in facilities[:10]:  # Limit to top 10
-            if facility.strip():
-                amenities.append(facility.strip())
-        return amenities
+        # Single fused pass over the first 10 entries, stripping once per
+        # facility instead of the old strip-to-test, strip-to-append pair
+        return [
+            stripped
+            for facility in hotel.get('hotel_facilities', '').split(',')[:10]
+            if (stripped := facility.strip())
+        ]
 
     def _generate_mock_hotels(
         self,
@@ -609,7 +828,10 @@ class HotelSearchService:
         Generate mock hotel data for testing.
         Creates realistic-looking hotel options based on intent.
         """
-        import random
+        # Bind the RNG methods once - the loop below draws eight values
+        # per hotel, and the per-call module/attribute lookups add up
+        uniform = random.uniform
+        randint = random.randint
 
         destination = intent.destination or "European City"
         nights = intent.duration_days or 7
@@ -658,12 +880,9 @@ class HotelSearchService:
             template = hotel_templates[i % len(hotel_templates)]
 
             # Generate price based on style and budget
-            if template["style"] == "luxury":
-                price_multiplier = random.uniform(1.5, 2.5)
-            elif template["style"] == "budget":
-                price_multiplier = random.uniform(0.5, 0.8)
-            else:
-                price_multiplier = random.uniform(0.9, 1.3)
+            price_multiplier = uniform(
+                *_MOCK_PRICE_RANGE.get(template["style"], _MOCK_PRICE_RANGE_DEFAULT)
+            )
 
             price_per_night = budget_per_night * price_multiplier
             total_price = price_per_night * nights
@@ -671,27 +890,34 @@ class HotelSearchService:
             mock_hotels.append(AccommodationOption(
                 name=f"{template['name']} - {i+1}",
                 type=template["type"],
-                address=f"{random.randint(1, 999)} {destination} Street",
+                address=f"{randint(1, 999)} {destination} Street",
                 city=destination,
                 country="Mock Country",
                 price_per_night=round(price_per_night, 2),
                 total_price=round(total_price, 2),
                 currency="EUR",
-                rating=template["rating"] + random.uniform(-0.3, 0.2),
-                review_count=random.randint(50, 1500),
+                rating=template["rating"] + uniform(-0.3, 0.2),
+                review_count=randint(50, 1500),
                 amenities=template["amenities"],
                 room_type="Standard Room" if template["type"] == "hotel" else "Apartment",
                 check_in=intent.departure_date or date.today(),
                 check_out=intent.return_date or date.today(),
-                latitude=random.uniform(40.0, 50.0),
-                longitude=random.uniform(-5.0, 15.0),
-                distance_to_center_km=round(random.uniform(0.5, 5.0), 1),
+                latitude=uniform(40.0, 50.0),
+                longitude=uniform(-5.0, 15.0),
+                distance_to_center_km=round(uniform(0.5, 5.0), 1),
                 booking_link=f"https://booking.com/mock-hotel-{i+1}",
                 source="mock_data"
             ))
 
-        # Sort by rating and price balance
-        mock_hotels.sort(key=lambda h: h.rating - (h.price_per_night / 1000), reverse=True)
+        # Sort by rating and price balance. Decorate-sort-undecorate with a
+        # precomputed score list: the comprehension scores each hotel with
+        # plain attribute reads and a multiply, and the sort key becomes a
+        # C-level itemgetter instead of a Python lambda frame per element
+        scores = [h.rating - h.price_per_night * 0.001 for h in mock_hotels]
+        mock_hotels = [
+            hotel
+            for _, hotel in sorted(zip(scores, mock_hotels), key=itemgetter(0), reverse=True)
+        ]
 
-        logger.info(f"Generated {len(mock_hotels)} mock hotels")
+        logger.info("Generated %d mock hotels", len(mock_hotels))
         return mock_hotels
@@ -2,15 +2,112 @@
 SerpAPI Client for Google Flights
 Scrapes Google Flights to get real-world flight data
 """
-from datetime import date, datetime
+import functools
+import json
+import threading
+import time
+from datetime import date, datetime, timezone
+from types import MappingProxyType
 from typing import List
-from serpapi import GoogleSearch
+import httpx
+import orjson
 from app.models.travel import FlightOption, FlightSegment, TravelIntent
+from app.services._validate_intent import validate_flight_intent
 from app.utils.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+_SERPAPI_URL = "https://serpapi.com/search"
+
+# Known city -> IATA code mappings, frozen at import so lookups never
+# rebuild the table
+_COMMON_AIRPORT_CODES = MappingProxyType({
+    # Europe
+    "copenhagen": "CPH",
+    "london": "LON",
+    "paris": "PAR",
+    "rome": "ROM",
+    "barcelona": "BCN",
+    "madrid": "MAD",
+    "berlin": "BER",
+    "amsterdam": "AMS",
+
+    # Japan
+    "kyoto": "KIX",
+    "tokyo": "TYO",
+    "osaka": "KIX",
+
+    # Other major cities
+    "new york": "NYC",
+    "los angeles": "LAX",
+    "dubai": "DXB",
+    "singapore": "SIN",
+})
+
+# Successful searches are cached briefly: every SerpAPI call is a
+# multi-second scrape against a hard paid quota, and users re-run
+# near-identical queries while refining a plan. Only non-empty results
+# are stored so transient errors and empty scrapes aren't poison-cached.
+_SEARCH_CACHE_MAXSIZE = 1024
+_SEARCH_CACHE_TTL = 600.0  # 10 minutes; fares move
+_search_cache: dict = {}
+_search_cache_lock = threading.Lock()
+
+# Coarse second-level cache keyed on (route, month, trip length) rather
+# than exact dates. Flexible-date exploration slides the same route and
+# duration across a month, and each slide is a fresh paid scrape; when
+# the intent allows date flexibility, a warm same-month result is close
+# enough for price context. Intents with zero flexibility never read
+# from this cache, but every successful search feeds it. Long TTL is
+# fine for ballpark fares.
+_COARSE_CACHE_MAXSIZE = 256
+_COARSE_CACHE_TTL = 6 * 3600.0
+_coarse_cache: dict = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _airport_code(location: str) -> str:
+    """
+    Airport code for a city, cached on the raw input - a module function
+    so the cache key is just the string, and repeat lookups during result
+    parsing skip the normalization entirely.
+    """
+    # Strip country if present - partition stops at the first comma
+    # instead of splitting out the whole tail
+    if ',' in location:
+        location = location.partition(',')[0].strip()
+
+    location_lower = location.lower().strip()
+
+    # If already a code, return as-is
+    if len(location) == 3 and location.isalpha():
+        return location.upper()
+
+    return _COMMON_AIRPORT_CODES.get(location_lower, location.upper()[:3])
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """
+    Timestamp parser for the segment hot loop. The Google Flights engine
+    emits exactly "YYYY-MM-DD HH:MM" (rarely with a trailing Z), so six
+    slice-to-int conversions replace fromisoformat's format scanning and
+    the per-call Z-replace allocation. The fast path is gated on that
+    exact length - anything longer (e.g. with seconds or an offset) or
+    otherwise shaped differently takes the flexible fallback instead of
+    being silently truncated.
+    """
+    if len(value.rstrip("Z")) <= 16:
+        try:
+            return datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]),
+                tzinfo=timezone.utc if value.endswith("Z") else None,
+            )
+        except ValueError:
+            pass
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 
 class SerpAPIFlightService:
     """
@@ -20,6 +117,16 @@ class SerpAPIFlightService:
 
     def __init__(self):
         self.api_key = settings.serpapi_key
+        # Persistent client keeps the TLS connection to serpapi.com warm
+        # across searches, saving a handshake per back-to-back query
+        self._http_client = httpx.Client(timeout=30.0)
+        # Static request parameters, copied into each search's params
+        self._base_params = {
+            "api_key": self.api_key,
+            "engine": "google_flights",
+            "currency": "EUR",
+            "hl": "en",
+        }
 
     def search_flights(
         self,
@@ -30,83 +137,142 @@ class SerpAPIFlightService:
         Search for flights using SerpAPI's Google Flights scraper.
         Returns list of FlightOption objects.
         """
-        if not self.api_key:
-            logger.warning("SerpAPI key not configured")
-            return []
-
-        if not intent.origin or not intent.destination:
-            logger.warning("Missing origin or destination for flight search")
+        if (invalid_reason := validate_flight_intent(intent)) is not None:
+            logger.warning("%s - intent not searchable yet", invalid_reason)
             return []
 
-        if not intent.departure_date or not intent.return_date:
-            logger.warning(f"Missing dates for flight search")
+        if not self.api_key:
+            logger.warning("SerpAPI key not configured")
             return []
 
         # Get airport codes
         origin_code = self._get_airport_code(intent.origin)
         dest_code = self._get_airport_code(intent.destination)
 
-        logger.info(f"🔍 SerpAPI searching: {intent.origin} ({origin_code}) -> {intent.destination} ({dest_code})")
-        logger.info(f"Dates: {intent.departure_date} to {intent.return_date}")
-        logger.info(f"Travelers: {intent.num_adults} adults, {intent.num_children} children")
+        # Normalized inputs double as the cache key, so equivalent
+        # phrasings of the same search collapse onto one entry
+        outbound_date = intent.departure_date.strftime("%Y-%m-%d")
+        return_date = intent.return_date.strftime("%Y-%m-%d")
+        cache_key = (
+            origin_code,
+            dest_code,
+            outbound_date,
+            return_date,
+            intent.num_adults,
+            intent.num_children,
+            "EUR",
+        )
+        coarse_key = (
+            origin_code,
+            dest_code,
+            outbound_date[:7],  # YYYY-MM
+            (intent.return_date - intent.departure_date).days,
+            intent.num_adults,
+            intent.num_children,
+        )
+        with _search_cache_lock:
+            cached = _search_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                # Refresh recency so eviction drops the least recently used
+                del _search_cache[cache_key]
+                _search_cache[cache_key] = cached
+                logger.info("🗄️  SerpAPI cache hit for %s -> %s", origin_code, dest_code)
+                return list(cached[1])[:max_results]
+
+            # Exact-date miss: a flexible intent can ride on a warm
+            # same-month, same-duration search instead of a fresh scrape
+            if intent.date_flexibility > 0:
+                coarse = _coarse_cache.get(coarse_key)
+                if coarse and coarse[0] > time.monotonic():
+                    logger.info(
+                        "🗄️  SerpAPI coarse cache hit for %s -> %s (%s, %d nights)",
+                        origin_code, dest_code, coarse_key[2], coarse_key[3],
+                    )
+                    return list(coarse[1])[:max_results]
+
+        logger.info("🔍 SerpAPI searching: %s (%s) -> %s (%s)", intent.origin, origin_code, intent.destination, dest_code)
+        logger.info("Dates: %s to %s", intent.departure_date, intent.return_date)
+        logger.info("Travelers: %d adults, %d children", intent.num_adults, intent.num_children)
 
         try:
             # Build SerpAPI parameters for Google Flights
             params = {
-                "api_key": self.api_key,
-                "engine": "google_flights",
+                **self._base_params,
                 "departure_id": origin_code,
                 "arrival_id": dest_code,
-                "outbound_date": intent.departure_date.strftime("%Y-%m-%d"),
-                "return_date": intent.return_date.strftime("%Y-%m-%d"),
+                "outbound_date": outbound_date,
+                "return_date": return_date,
                 "adults": intent.num_adults,
-                "currency": "EUR",
-                "hl": "en",
             }
 
             # Add children if present
             if intent.num_children > 0:
                 params["children"] = intent.num_children
 
-            # Execute search
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            # Execute search. The SerpAPI SDK funnels this through
+            # requests + stdlib json; calling the endpoint directly and
+            # decoding with orjson cuts the parse cost of the large
+            # multi-option responses to a fraction. Error payloads come
+            # back as JSON too, so decode before checking the status.
+            response = self._http_client.get(_SERPAPI_URL, params=params)
+            results = orjson.loads(response.content)
 
             # Check for errors FIRST
             if 'error' in results:
                 error_msg = results['error']
-                logger.error(f"❌ SerpAPI Error: {error_msg}")
+                logger.error("❌ SerpAPI Error: %s", error_msg)
                 if "run out of searches" in error_msg.lower():
                     logger.error("💳 SerpAPI quota exceeded. Please upgrade your plan or use Amadeus fallback.")
                 raise Exception(f"SerpAPI Error: {error_msg}")
 
             # DEBUG: Log raw response
-            logger.info(f"🔍 SerpAPI RAW RESPONSE KEYS: {results.keys()}")
-            logger.info(f"🔍 Best flights count: {len(results.get('best_flights', []))}")
-            logger.info(f"🔍 Other flights count: {len(results.get('other_flights', []))}")
+            logger.info("🔍 SerpAPI RAW RESPONSE KEYS: %s", results.keys())
+            logger.info("🔍 Best flights count: %d", len(results.get('best_flights', [])))
+            logger.info("🔍 Other flights count: %d", len(results.get('other_flights', [])))
 
             # Log search metadata
             if 'search_metadata' in results:
-                logger.info(f"🔍 Search status: {results['search_metadata'].get('status')}")
+                logger.info("🔍 Search status: %s", results['search_metadata'].get('status'))
 
-            # DEBUG: Log full response for troubleshooting
-            import json
-            logger.debug(f"🔍 FULL SerpAPI RESPONSE: {json.dumps(results, indent=2, default=str)}")
+            # DEBUG: Log full response for troubleshooting. The responses
+            # run to hundreds of KB, so only serialize when debug is
+            # actually on, and skip pretty-printing
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 FULL SerpAPI RESPONSE: %s", json.dumps(results, default=str))
 
             # Parse results
             flight_options = self._parse_results(results, intent)
 
-            logger.info(f"✅ SerpAPI found {len(flight_options)} flight options")
+            logger.info("✅ SerpAPI found %d flight options", len(flight_options))
+
+            if flight_options:
+                now = time.monotonic()
+                with _search_cache_lock:
+                    if len(_search_cache) >= _SEARCH_CACHE_MAXSIZE:
+                        _search_cache.pop(next(iter(_search_cache)))
+                    _search_cache[cache_key] = (
+                        now + _SEARCH_CACHE_TTL, flight_options
+                    )
+                    if len(_coarse_cache) >= _COARSE_CACHE_MAXSIZE:
+                        _coarse_cache.pop(next(iter(_coarse_cache)))
+                    _coarse_cache[coarse_key] = (
+                        now + _COARSE_CACHE_TTL, flight_options
+                    )
+
             return flight_options[:max_results]
 
         except Exception as e:
-            logger.error(f"SerpAPI error: {e}", exc_info=True)
+            logger.error("SerpAPI error: %s", e, exc_info=True)
             return []
 
     def _parse_results(self, results: dict, intent: TravelIntent) -> List[FlightOption]:
         """Parse SerpAPI results into FlightOption objects"""
         flight_options = []
 
+        # Resolve the origin code once - the outbound/return split below
+        # compares it against every segment of every flight
+        origin_code = _airport_code(intent.origin)
+
         # Get best flights from results
         best_flights = results.get("best_flights", [])
         other_flights = results.get("other_flights", [])
@@ -121,33 +287,27 @@ class SerpAPIFlightService:
                 if len(flights) < 2:
                     continue  # Need both outbound and return
 
-                # Outbound is first set of segments, return is second set
-                # Find where return journey starts (when departure airport matches destination)
-                outbound_segments = []
-                return_segments = []
-
-                is_return = False
-                for segment in flights:
-                    if not is_return and segment.get("departure_airport", {}).get("id") == self._get_airport_code(intent.origin):
-                        is_return = True if outbound_segments else False
-
-                    if is_return or (outbound_segments and segment.get("departure_airport", {}).get("id") != outbound_segments[-1].get("arrival_airport", {}).get("id")):
-                        is_return = True
-
-                    seg = self._parse_segment(segment)
-                    if not is_return:
-                        outbound_segments.append(seg)
-                    else:
-                        return_segments.append(seg)
-
-                # If we couldn't split properly, try simpler approach
-                if not return_segments:
-                    mid_point = len(flights) // 2
-                    outbound_segments = [self._parse_segment(seg) for seg in flights[:mid_point]]
-                    return_segments = [self._parse_segment(seg) for seg in flights[mid_point:]]
-
-                # Calculate total duration
-                total_duration = sum(seg.duration_minutes for seg in outbound_segments + return_segments)
+                # Parse every segment exactly once up front, then split the
+                # parsed list at the return-journey boundary
+                parsed = [self._parse_segment(segment) for segment in flights]
+                total_duration = sum(seg.duration_minutes for seg in parsed)
+
+                # The return journey starts at the first segment that
+                # departs from the origin again or breaks the chain
+                # (departure airport differs from the previous arrival);
+                # when neither shows up, assume a symmetric round trip and
+                # split at the midpoint
+                split_idx = next(
+                    (
+                        i for i in range(1, len(flights))
+                        if flights[i].get("departure_airport", {}).get("id") == origin_code
+                        or flights[i].get("departure_airport", {}).get("id")
+                        != flights[i - 1].get("arrival_airport", {}).get("id")
+                    ),
+                    len(flights) // 2,
+                )
+                outbound_segments = parsed[:split_idx]
+                return_segments = parsed[split_idx:]
 
                 # Count stops
                 num_stops = (len(outbound_segments) - 1) + (len(return_segments) - 1)
@@ -170,7 +330,7 @@ class SerpAPIFlightService:
                 flight_options.append(flight_option)
 
             except Exception as e:
-                logger.error(f"Error parsing flight: {e}")
+                logger.error("Error parsing flight: %s", e)
                 continue
 
         return flight_options
@@ -182,8 +342,8 @@ class SerpAPIFlightService:
         arrival_time = segment.get("arrival_airport", {}).get("time")
 
         # Convert to datetime objects
-        departure = datetime.fromisoformat(departure_time.replace("Z", "+00:00")) if departure_time else datetime.now()
-        arrival = datetime.fromisoformat(arrival_time.replace("Z", "+00:00")) if arrival_time else datetime.now()
+        departure = _parse_timestamp(departure_time) if departure_time else datetime.now()
+        arrival = _parse_timestamp(arrival_time) if arrival_time else datetime.now()
 
         # Parse duration
         duration_minutes = segment.get("duration", 0)
@@ -205,37 +365,4 @@ class SerpAPIFlightService:
         Get airport code for a city.
         Uses same logic as Amadeus client for consistency.
         """
-        # Strip country if present
-        if ',' in location:
-            location = location.split(',')[0].strip()
-
-        common_codes = {
-            # Europe
-            "copenhagen": "CPH",
-            "london": "LON",
-            "paris": "PAR",
-            "rome": "ROM",
-            "barcelona": "BCN",
-            "madrid": "MAD",
-            "berlin": "BER",
-            "amsterdam": "AMS",
-
-            # Japan
-            "kyoto": "KIX",
-            "tokyo": "TYO",
-            "osaka": "KIX",
-
-            # Other major cities
-            "new york": "NYC",
-            "los angeles": "LAX",
-            "dubai": "DXB",
-            "singapore": "SIN",
-        }
-
-        location_lower = location.lower().strip()
-
-        # If already a code, return as-is
-        if len(location) == 3 and location.isalpha():
-            return location.upper()
-
-        return common_codes.get(location_lower, location.upper()[:3])
+        return _airport_code(location)
@@ -2,9 +2,11 @@
 Authentication Utilities
 Handles JWT tokens and Google OAuth verification.
 """
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Dict, Optional, Tuple
+import jwt
+from jwt import InvalidTokenError as JWTError
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from app.utils.config import settings
@@ -16,6 +18,19 @@ logger = logging.getLogger(__name__)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Shared transport for Google token verification: each Request() owns its
+# own requests.Session, so reusing one keeps the TLS connection to
+# Google's endpoints pooled instead of re-handshaking per login
+_GOOGLE_TRANSPORT = requests.Request()
+
+# Decoded-token cache: signature verification runs once per unique token
+# per minute instead of on every authenticated request. The short TTL
+# bounds how long a revoked secret keeps validating, and the exp claim is
+# still re-checked on every call below.
+_TOKEN_CACHE_MAXSIZE = 10_000
+_TOKEN_CACHE_TTL = 60.0
+_token_cache: Dict[str, Tuple[float, Optional[dict]]] = {}
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -26,18 +41,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
+    # PyJWT returns a str directly, and its HMAC runs through OpenSSL
+    # rather than python-jose's pure-Python path
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[dict]:
-    """Verify JWT token and return payload"""
+def _decode_token(token: str) -> Optional[dict]:
+    """Decode and signature-check a JWT, returning its payload or None"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        return payload
+        return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
     except JWTError as e:
-        logger.error(f"Token verification failed: {e}")
+        logger.error("Token verification failed: %s", e)
+        return None
+
+
+def verify_token(token: str) -> Optional[dict]:
+    """Verify JWT token and return payload"""
+    now = time.monotonic()
+    cached = _token_cache.get(token)
+    if cached and cached[0] > now:
+        payload = cached[1]
+    else:
+        payload = _decode_token(token)
+        # Drop oldest entry when full (insertion order is good enough here)
+        if len(_token_cache) >= _TOKEN_CACHE_MAXSIZE:
+            _token_cache.pop(next(iter(_token_cache)))
+        _token_cache[token] = (now + _TOKEN_CACHE_TTL, payload)
+
+    # Expiry is enforced outside the cache so a token can't outlive its
+    # exp claim just because its decode was cached
+    if payload is not None and payload.get("exp", 0) <= time.time():
         return None
+    return payload
 
 
 async def verify_google_token(token: str) -> Optional[dict]:
@@ -49,7 +85,7 @@ async def verify_google_token(token: str) -> Optional[dict]:
         # Verify the token with Google
         idinfo = id_token.verify_oauth2_token(
             token,
-            requests.Request(),
+            _GOOGLE_TRANSPORT,
             settings.google_client_id
         )
 
@@ -1,6 +1,8 @@
 """
 Configuration management using Pydantic Settings.
 """
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 from typing import List, Union
@@ -32,6 +34,12 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379"
 
+    # Search tuning
+    outbound_concurrency: int = 8  # Max concurrent outbound travel-API calls
+    search_timeout_seconds: float = 45.0  # Overall budget for one search fan-out
+    llm_batch_concurrency: int = 8  # Max concurrent LLM calls in batch parsing
+    flight_combo_probes: int = 4  # Max alt-origin x alt-dest combos per flight fallback
+
     # App Settings
     environment: str = "development"
     debug: bool = True
@@ -70,5 +78,16 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Construct the settings exactly once per process. Building Settings
+    re-reads .env and re-validates every field, so anything that wants a
+    fresh handle (importlib.reload-style patterns, FastAPI dependencies)
+    should go through this accessor instead of calling Settings().
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
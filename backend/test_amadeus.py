@@ -7,6 +7,7 @@ import sys
 from datetime import datetime, timedelta
 from amadeus import Client, ResponseError
 import json
+import orjson
 
 # Add app to path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -68,10 +69,15 @@ def test_amadeus():
                     print(f"  Carrier: {first_segment['carrierCode']} {first_segment['number']}")
 
             # Save full response
-            output_file = "amadeus_test_response.json"
-            with open(output_file, 'w') as f:
-                # Convert response.data to dict for JSON serialization
-                json.dump([dict(offer) for offer in response.data], f, indent=2, default=str)
+            # One offer per line (NDJSON) instead of one big pretty-printed
+            # array: peak memory stays at a single offer, and partial
+            # output survives a crash mid-dump. Read back with
+            # [orjson.loads(line) for line in open(output_file, 'rb')]
+            output_file = "amadeus_test_response.ndjson"
+            with open(output_file, 'wb') as f:
+                for offer in response.data:
+                    f.write(orjson.dumps(dict(offer), default=str))
+                    f.write(b"\n")
             print(f"\n💾 Full response saved to: {output_file}")
 
         else:
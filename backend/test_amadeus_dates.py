@@ -2,6 +2,7 @@
 Test if Amadeus has data for the dates the Intent Parser is suggesting
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from amadeus import Client, ResponseError
 
@@ -19,10 +20,9 @@ test_dates = [
     ("2026-01-15", "2026-01-22", "Early 2026 (Jan)"),
 ]
 
-for departure, return_date, description in test_dates:
-    print(f"\nTesting: {description}")
-    print(f"  Dates: {departure} to {return_date}")
-
+def search_dates(args):
+    """Run one search; return (description, dates, data, error) for printing"""
+    departure, return_date, description = args
     try:
         response = client.shopping.flight_offers_search.get(
             originLocationCode='CPH',
@@ -33,11 +33,25 @@ for departure, return_date, description in test_dates:
             max=5,
             currencyCode='EUR'
         )
+        return description, departure, return_date, response.data, None
+    except ResponseError as error:
+        return description, departure, return_date, None, error
 
-        print(f"  ✅ Found {len(response.data)} flights")
-        if len(response.data) > 0:
-            print(f"     Price: {response.data[0]['price']['total']} EUR")
 
-    except ResponseError as error:
-        print(f"  ❌ ERROR: {error.description}")
-        print(f"     Status: {error.response.status_code}")
+if __name__ == "__main__":
+    # Each search is a multi-second network round-trip, so run all three
+    # concurrently - total time is the slowest call instead of the sum.
+    # map() yields in submission order, keeping the output deterministic.
+    with ThreadPoolExecutor(max_workers=len(test_dates)) as executor:
+        for description, departure, return_date, data, error in executor.map(search_dates, test_dates):
+            print(f"\nTesting: {description}")
+            print(f"  Dates: {departure} to {return_date}")
+
+            if error is not None:
+                print(f"  ❌ ERROR: {error.description}")
+                print(f"     Status: {error.response.status_code}")
+                continue
+
+            print(f"  ✅ Found {len(data)} flights")
+            if len(data) > 0:
+                print(f"     Price: {data[0]['price']['total']} EUR")
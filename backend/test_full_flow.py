@@ -2,8 +2,10 @@
 Test the full flow from TravelIntent to flight results
 This mimics exactly what happens in production
 """
+import asyncio
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
 
@@ -18,7 +20,35 @@ from app.services.serpapi_client import SerpAPIFlightService
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def test_with_intent():
+
+def print_provider_results(name, outcome, show_route=False):
+    """Print one provider's results (or error) in the shared format"""
+    print(f"\n" + "=" * 80)
+    print(f"{name} RESULTS")
+    print("=" * 80)
+
+    if isinstance(outcome, Exception):
+        print(f"\n❌ {name} error: {outcome}")
+        return
+
+    flights = outcome
+    print(f"\n✅ {name} returned {len(flights)} flights")
+
+    if not flights:
+        print(f"\n⚠️  No flights found")
+        return
+
+    flight = flights[0]
+    print(f"\n🎯 Sample Flight:")
+    print(f"  Price: {flight.total_price} {flight.currency}")
+    print(f"  Duration: {flight.total_duration_minutes} minutes")
+    print(f"  Stops: {flight.number_of_stops}")
+    if show_route:
+        print(f"  Outbound: {flight.outbound_segments[0].origin} -> {flight.outbound_segments[-1].destination}")
+        print(f"  Return: {flight.return_segments[0].origin} -> {flight.return_segments[-1].destination}")
+
+
+async def test_with_intent():
     """Test flight search with a TravelIntent object (just like production)"""
 
     # Create a TravelIntent for Copenhagen to Kyoto
@@ -50,55 +80,24 @@ def test_with_intent():
     print(f"  Children: {intent.num_children}")
     print(f"  Budget: {intent.total_budget}")
 
-    # Test Amadeus (this is what the production code does)
-    print(f"\n" + "=" * 80)
-    print("TESTING AMADEUS SERVICE")
-    print("=" * 80)
-
+    # Run both providers concurrently - each blocks for multi-second
+    # network I/O, so wall-clock time is max() instead of sum(). Both
+    # SDKs are synchronous, so the executor bridges them onto the loop.
     amadeus_service = AmadeusFlightService()
-
-    try:
-        flights = amadeus_service.search_flights(intent, max_results=5)
-        print(f"\n✅ Amadeus returned {len(flights)} flights")
-
-        if flights:
-            print(f"\n🎯 Sample Flight:")
-            flight = flights[0]
-            print(f"  Price: {flight.total_price} {flight.currency}")
-            print(f"  Duration: {flight.total_duration_minutes} minutes")
-            print(f"  Stops: {flight.number_of_stops}")
-            print(f"  Outbound: {flight.outbound_segments[0].origin} -> {flight.outbound_segments[-1].destination}")
-            print(f"  Return: {flight.return_segments[0].origin} -> {flight.return_segments[-1].destination}")
-        else:
-            print(f"\n⚠️  No flights found")
-
-    except Exception as e:
-        print(f"\n❌ Amadeus error: {e}")
-        import traceback
-        traceback.print_exc()
-
-    # Test SerpAPI
-    print(f"\n" + "=" * 80)
-    print("TESTING SERPAPI SERVICE")
-    print("=" * 80)
-
     serpapi_service = SerpAPIFlightService()
 
-    try:
-        flights = serpapi_service.search_flights(intent, max_results=5)
-        print(f"\n✅ SerpAPI returned {len(flights)} flights")
+    print(f"\n🔍 Searching Amadeus and SerpAPI in parallel...")
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        amadeus_result, serpapi_result = await asyncio.gather(
+            loop.run_in_executor(pool, amadeus_service.search_flights, intent, 5),
+            loop.run_in_executor(pool, serpapi_service.search_flights, intent, 5),
+            return_exceptions=True,
+        )
 
-        if flights:
-            print(f"\n🎯 Sample Flight:")
-            flight = flights[0]
-            print(f"  Price: {flight.total_price} {flight.currency}")
-            print(f"  Duration: {flight.total_duration_minutes} minutes")
-            print(f"  Stops: {flight.number_of_stops}")
-        else:
-            print(f"\n⚠️  No flights found")
+    print_provider_results("AMADEUS", amadeus_result, show_route=True)
+    print_provider_results("SERPAPI", serpapi_result)
 
-    except Exception as e:
-        print(f"\n⚠️  SerpAPI error (expected - quota exceeded): {e}")
 
 if __name__ == "__main__":
-    test_with_intent()
+    asyncio.run(test_with_intent())
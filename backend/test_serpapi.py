@@ -7,6 +7,7 @@ import sys
 from datetime import datetime, timedelta
 from serpapi import GoogleSearch
 import json
+import orjson
 
 # Add app to path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -72,9 +73,11 @@ def test_serpapi():
             print(f"  Keys: {list(first_flight.keys())}")
 
         # Save full response for inspection
+        # orjson serializes the 500 KB+ response several times faster than
+        # stdlib json and emits bytes directly, so write in binary mode
         output_file = "serpapi_test_response.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
         print(f"\n💾 Full response saved to: {output_file}")
 
     except Exception as e: